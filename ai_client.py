@@ -0,0 +1,168 @@
+'''
+ai_client.py
+
+Async client for the AI server (ai.thewcl.com), shared by player_engine and AIPlayer.
+Requests go over one keep-alive connection pool per server, at most MAX_IN_FLIGHT run
+at once across the whole process, and each decision has a latency budget: when no
+answer arrives in time the caller gets None and falls back to a local heuristic, so
+AI players never hold up a game for long.
+'''
+
+import asyncio
+import os
+from typing import Any, Optional
+
+import httpx
+
+AI_SERVER_URL = "http://ai.thewcl.com:6502"
+# Most AI requests running at once in this process
+MAX_IN_FLIGHT = int(os.getenv("MONOPOLY_AI_MAX_IN_FLIGHT", "8"))
+# Seconds a decision may wait for the model, including time queued for a slot
+DECISION_BUDGET = float(os.getenv("MONOPOLY_AI_BUDGET", "8"))
+# Seconds after which a second, identical request races the first (unset: never)
+HEDGE_AFTER = float(os.environ["MONOPOLY_AI_HEDGE_AFTER"]) if os.getenv("MONOPOLY_AI_HEDGE_AFTER") else None
+
+DEFAULT_SYSTEM_PROMPT = "You are an AI playing Monopoly. Make strategic decisions based on the game state."
+
+_in_flight = asyncio.Semaphore(MAX_IN_FLIGHT)
+_clients: dict[tuple, "AIClient"] = {}
+
+
+def chat_text(result: Any) -> str:
+    """Extract the answer text from an AI server /chat response body."""
+    # Parse the actual API response format
+    if isinstance(result, dict):
+        # Try to extract from the actual API format
+        if "output" in result and len(result["output"]) > 0:
+            output = result["output"][0]
+            if "content" in output and len(output["content"]) > 0:
+                content = output["content"][0]
+                if "text" in content:
+                    return content["text"].strip()
+        # Fallback to other possible formats
+        if "content" in result:
+            return result["content"].strip()
+        elif "response" in result:
+            return result["response"].strip()
+        else:
+            # If it's just a string response
+            return str(result).strip()
+    else:
+        # If it's a string response
+        return str(result).strip()
+
+
+class AIClient:
+    """
+    Sends requests to one AI server with one API key.
+
+    post() and chat() return None instead of raising when the request fails or the
+    budget runs out. The counters record how often that happens.
+    """
+
+    def __init__(self, server_url: str = AI_SERVER_URL, api_key: Optional[str] = None,
+                 budget: float = DECISION_BUDGET, hedge_after: Optional[float] = HEDGE_AFTER):
+        self.server_url = server_url
+        self.api_key = api_key or os.getenv('OPENAI_API_KEY')
+        self.budget = budget
+        self.hedge_after = hedge_after
+        self.requests = 0
+        self.hedges = 0
+        self.timeouts = 0
+        self.errors = 0
+        self._http: Optional[httpx.AsyncClient] = None
+
+    def _client(self) -> httpx.AsyncClient:
+        if self._http is None:
+            self._http = httpx.AsyncClient(
+                base_url=self.server_url,
+                headers={"Authorization": f"Bearer {self.api_key}"},
+                timeout=httpx.Timeout(30.0),
+                limits=httpx.Limits(max_connections=MAX_IN_FLIGHT * 2, max_keepalive_connections=MAX_IN_FLIGHT),
+            )
+        return self._http
+
+    async def post(self, path: str, payload: dict, budget: Optional[float] = None) -> Optional[Any]:
+        """
+        POST 'payload' as JSON and return the decoded response, or None if there is no
+        API key, the request failed, or no response arrived within 'budget' seconds
+        (the client's budget by default).
+        """
+        if not self.api_key:
+            print("Warning: No OpenAI API key found. Using fallback decision.")
+            return None
+        try:
+            async with asyncio.timeout(self.budget if budget is None else budget):
+                return await self._hedged(path, payload)
+        except TimeoutError:
+            self.timeouts += 1
+            print("AI request timed out. Using fallback decision.")
+        except (httpx.HTTPError, ValueError) as e:
+            self.errors += 1
+            print(f"Error making AI request: {e}")
+        return None
+
+    async def chat(self, user_prompt: str, system_prompt: Optional[str] = None, model: str = "gpt-4.1-nano",
+                   budget: Optional[float] = None, max_tokens: Optional[int] = None) -> Optional[str]:
+        """
+        Ask the server's /chat endpoint; returns the answer text or None (see post).
+        max_tokens caps the length of the answer.
+        """
+        payload = {
+            "model": model,
+            "system_prompt": system_prompt or DEFAULT_SYSTEM_PROMPT,
+            "user_prompt": user_prompt,
+        }
+        if max_tokens is not None:
+            payload["max_output_tokens"] = max_tokens
+        result = await self.post("/chat", payload, budget)
+        return None if result is None else chat_text(result)
+
+    async def _attempt(self, path: str, payload: dict) -> Any:
+        async with _in_flight:
+            self.requests += 1
+            response = await self._client().post(path, json=payload)
+            response.raise_for_status()
+            return response.json()
+
+    async def _hedged(self, path: str, payload: dict) -> Any:
+        attempts = {asyncio.ensure_future(self._attempt(path, payload))}
+        hedge_after = self.hedge_after
+        error = None
+        try:
+            while attempts:
+                done, attempts = await asyncio.wait(attempts, timeout=hedge_after, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    # The first request is slow; race a second one against it
+                    self.hedges += 1
+                    attempts.add(asyncio.ensure_future(self._attempt(path, payload)))
+                    hedge_after = None
+                    continue
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in attempts:
+                task.cancel()
+
+    async def aclose(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+
+
+def get_ai_client(server_url: str = AI_SERVER_URL, api_key: Optional[str] = None) -> AIClient:
+    """Return the process-wide client for a server and API key, creating it on first use."""
+    key = (server_url, api_key or os.getenv('OPENAI_API_KEY'))
+    client = _clients.get(key)
+    if client is None:
+        client = _clients[key] = AIClient(server_url, api_key)
+    return client
+
+
+async def close_ai_clients():
+    for client in _clients.values():
+        await client.aclose()
+    _clients.clear()
@@ -0,0 +1,112 @@
+'''
+ai_decisions.py
+
+JSON protocol for AI decisions. Each kind of decision has a DecisionSchema: the JSON
+object the model must reply with, a validator that turns the reply into a decision
+(or explains what is wrong with it) and a max_tokens sized to the reply. A reply
+that does not validate gets one repair request quoting the problem; if that fails
+too, the caller falls back to its own heuristic.
+'''
+
+import json
+from typing import Any, Awaitable, Callable, Optional
+
+from decision_cache import DecisionCache
+
+
+class DecisionSchema:
+    """
+    The reply format for one kind of decision.
+
+    validate(reply, context) gets the reply's JSON object and whatever context the
+    caller passed (e.g. the options on offer), and returns the decision as a dict or
+    raises ValueError saying what is wrong.
+    """
+
+    def __init__(self, name: str, format: str, validate: Callable[[dict, Any], dict], max_tokens: int):
+        self.name = name
+        self.format = format
+        self.validate = validate
+        self.max_tokens = max_tokens
+
+    @property
+    def instructions(self) -> str:
+        return f"Respond with only a JSON object, no other text:\n{self.format}"
+
+    def parse(self, reply: str, context: Any = None) -> dict:
+        """Validate a reply, which may have text around its JSON object. Raises ValueError."""
+        start, end = reply.find("{"), reply.rfind("}")
+        if start == -1 or end < start:
+            raise ValueError("the reply has no JSON object")
+        try:
+            decision = json.loads(reply[start:end + 1])
+        except json.JSONDecodeError as e:
+            raise ValueError(f"the JSON is malformed ({e.msg})")
+        if not isinstance(decision, dict):
+            raise ValueError("the reply is not a JSON object")
+        return self.validate(decision, context)
+
+
+def field(decision: dict, key: str, kind: type, choices=None):
+    """Read a required field of a reply, checking its type (and value, if 'choices' is given)."""
+    if key not in decision:
+        raise ValueError(f'"{key}" is missing')
+    value = decision[key]
+    # bool is an int subclass, so check it both ways
+    if not isinstance(value, kind) or (kind is int and isinstance(value, bool)):
+        raise ValueError(f'"{key}" must be of type {kind.__name__}')
+    if choices is not None and value not in choices:
+        raise ValueError(f'"{key}" must be one of {sorted(choices, key=str)}')
+    return value
+
+
+def int_list(decision: dict, key: str, allowed=None) -> list[int]:
+    """Read a list of ints, dropping any that are not in 'allowed'."""
+    values = field(decision, key, list)
+    if not all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        raise ValueError(f'"{key}" must be a list of integers')
+    return values if allowed is None else [value for value in values if value in allowed]
+
+
+async def structured_decision(ask: Callable[[str, int], Awaitable[Optional[str]]], prompt: str,
+                              schema: DecisionSchema, context: Any = None,
+                              cache: Optional[DecisionCache] = None, cache_key: Optional[tuple] = None) -> Optional[dict]:
+    """
+    Get a decision matching 'schema'. ask(prompt, max_tokens) sends one request to
+    the model and returns its reply, or None if there was none.
+
+    A decision cached under cache_key is reused without asking. Otherwise the model
+    is asked, and asked once more with the validation error if its reply does not
+    match; valid decisions are cached. Returns None when there is no valid decision,
+    and the caller should fall back to a heuristic.
+    """
+    if cache is not None and cache_key is not None:
+        cached = cache.get(cache_key)
+        if cached is not None:
+            try:
+                return schema.parse(cached, context)
+            except ValueError:
+                pass
+
+    reply = await ask(f"{prompt}\n\n{schema.instructions}", schema.max_tokens)
+    if reply is None:
+        return None
+    try:
+        decision = schema.parse(reply, context)
+    except ValueError as e:
+        print(f"Invalid {schema.name} reply ({e}), asking again")
+        reply = await ask(
+            f"{prompt}\n\nYour previous reply was:\n{reply}\n\nThat is not valid: {e}. {schema.instructions}",
+            schema.max_tokens,
+        )
+        if reply is None:
+            return None
+        try:
+            decision = schema.parse(reply, context)
+        except ValueError as e:
+            print(f"Invalid {schema.name} reply again ({e})")
+            return None
+
+    if cache is not None and cache_key is not None:
+        cache.put(cache_key, json.dumps(decision, separators=(",", ":")))
+    return decision
@@ -2,14 +2,52 @@
 ai_player.py
 
 Defines the AIPlayer class that extends Player to use ChatGPT for decision making.
+Decisions are async: they go through the shared ai_client, and fall back to the local
+HeuristicPolicy when the model does not answer within the client's latency budget.
+
+HeuristicPolicy scores purchases, house builds, jail actions and mortgages from
+tables precomputed once from the board template (landing probabilities and rents),
+so each decision takes microseconds. It also plays player_engine's --auto bots and
+simulation.py's "heuristic" strategy.
 '''
 
-import json
+import functools
 import os
-import requests
 from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass
 from player import Player
+from ai_client import AI_SERVER_URL, AIClient, get_ai_client
+from ai_decisions import DecisionSchema, field, structured_decision
+from decision_cache import DecisionCache, jail_key, purchase_key
+
+
+# Shared by every AIPlayer in the process unless one is given its own
+decision_cache = DecisionCache(path=os.getenv("MONOPOLY_DECISION_CACHE"))
+
+
+def _validate_jail_action(reply: dict, cards: int) -> dict:
+    choices = {"pay", "roll", "card"} if cards > 0 else {"pay", "roll"}
+    return {"action": field(reply, "action", str, choices)}
+
+
+def _validate_mortgage(reply: dict, owned: set) -> dict:
+    names = field(reply, "mortgage", list)
+    if not all(isinstance(name, str) for name in names):
+        raise ValueError('"mortgage" must be a list of property names')
+    # Names of properties we do not own are dropped rather than sent back for repair
+    return {"mortgage": [name for name in names if name in owned]}
+
+
+# Reply formats for each decision (see ai_decisions)
+PURCHASE = DecisionSchema("purchase", '{"buy":true|false}',
+                          lambda reply, context: {"buy": field(reply, "buy", bool)}, max_tokens=12)
+JAIL_ACTION = DecisionSchema("jail action", '{"action":"pay"|"roll"|"card"}', _validate_jail_action, max_tokens=12)
+TRADE = DecisionSchema("trade", '{"accept":true|false}',
+                       lambda reply, context: {"accept": field(reply, "accept", bool)}, max_tokens=12)
+MORTGAGE = DecisionSchema("mortgage", '{"mortgage":["property name", ...]}', _validate_mortgage, max_tokens=120)
+
+# HeuristicPolicy.jail_action's /jail_action names -> decide_jail_action's
+JAIL_ACTIONS = {"use_card": "card", "pay_fine": "pay", "roll": "roll"}
 
 
 @dataclass
@@ -26,73 +64,434 @@ class GameState:
     special_situation: Optional[str] = None
 
 
+# Turns of income a purchase or house is expected to earn over
+INCOME_HORIZON = 60
+# Turns of expected rent owed to opponents to keep in cash before buying or building
+RUNWAY_TURNS = 6
+MIN_RESERVE = 50
+# How much of a street group's developed (three-house) income counts before it is complete
+DEVELOPMENT_WEIGHT = 0.5
+DEVELOPED_LEVEL = 4  # rent index for three houses
+# Share of a property's price that a chance to buy it is worth, when deciding to leave jail
+OPPORTUNITY_SHARE = 0.5
+JAIL_FINE = 50
+AVERAGE_ROLL = 7
+UTILITY_MULTIPLIERS = (4, 10)
+PROPERTY_KINDS = ("regular_properties", "railroad_properties", "utility_properties")
+
+
+class BoardTemplate:
+    """
+    Per-position tables for the fixed board, indexed by position: group, price, house
+    cost and rent by level, plus landing probabilities from the Markov model (long
+    run, and for the next turn from each space or from jail).
+
+    A street's rent level is 0 without the monopoly, 1 with it and 2-6 for 1-4
+    houses and a hotel, as in MonopolyBoard._calculate_rent; a railroad's or
+    utility's is the number of its group the owner holds, minus one.
+    """
+
+    def __init__(self, property_data: dict, landing_model, jail_position: int):
+        self.name = {}
+        self.position_of = {}
+        self.group = {}
+        self.members = {}
+        self.price = {}
+        self.house_cost = {}
+        self.rents = {}
+        self.streets = set()
+        for group, properties in property_data.items():
+            self.members[group] = tuple(prop["position"] for prop in properties)
+            for prop in properties:
+                position = prop["position"]
+                self.name[position] = prop["name"]
+                self.position_of[prop["name"]] = position
+                self.group[position] = group
+                self.price[position] = prop["price"]
+                if group == "Utilities":
+                    # Rent is a multiple of the roll; score it at the average roll
+                    self.rents[position] = [AVERAGE_ROLL * multiplier for multiplier in UTILITY_MULTIPLIERS]
+                else:
+                    self.rents[position] = list(prop["rent"])
+                if "house_cost" in prop:
+                    self.house_cost[position] = prop["house_cost"]
+                    self.streets.add(position)
+
+        self.landing = [float(p) for p in landing_model.landing_probabilities()]
+        board_size = len(self.landing)
+        self.next_landing = [[float(p) for p in landing_model.transient(1, start)[1]] for start in range(board_size)]
+        # The first state after the board spaces is a token starting its first turn in jail
+        self.next_landing_from_jail = [float(p) for p in landing_model.transient(1, board_size)[1]]
+        self.jail_position = jail_position
+
+    def rent(self, position: int, held: int, houses: int = 0) -> int:
+        """Rent at 'position' for an owner of 'held' properties of its group with 'houses' on it."""
+        rents = self.rents[position]
+        if position in self.streets:
+            if held < len(self.members[self.group[position]]):
+                return rents[0]
+            return rents[1 + houses]
+        return rents[min(held, len(rents)) - 1]
+
+
+@functools.cache
+def board_template() -> BoardTemplate:
+    """The BoardTemplate for game_board's property data, built once per process."""
+    # Imported here so AI players that never fall back do not load the server module
+    from game_board import property_data
+    from markov import JAIL_POSITION, solve
+    return BoardTemplate(property_data, solve(), JAIL_POSITION)
+
+
+class BoardView:
+    """
+    The parts of a game HeuristicPolicy reads: the owner, houses and mortgages of
+    owned properties by position, how many of each group every owner holds, and
+    each player's cash, position and jail state (as in a board state's players).
+    """
+
+    __slots__ = ("template", "owner", "houses", "mortgaged", "counts", "players")
+
+    def __init__(self, template: Optional[BoardTemplate] = None):
+        self.template = template or board_template()
+        self.owner = {}
+        self.houses = {}
+        self.mortgaged = set()
+        self.counts = {}  # (owner, group) -> properties held
+        self.players = {}
+
+    def own(self, position: int, owner: str, houses: int = 0, mortgaged: bool = False):
+        self.owner[position] = owner
+        if houses:
+            self.houses[position] = houses
+        if mortgaged:
+            self.mortgaged.add(position)
+        key = (owner, self.template.group[position])
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def seat(self, name: str, money: int, position: int = 0, in_jail: bool = False,
+             get_out_of_jail_free: int = 0, bankrupt: bool = False):
+        self.players[name] = {
+            "name": name, "money": money, "position": position, "in_jail": in_jail,
+            "get_out_of_jail_free": get_out_of_jail_free, "bankrupt": bankrupt,
+        }
+
+    @classmethod
+    def from_state(cls, state: dict, template: Optional[BoardTemplate] = None) -> "BoardView":
+        """View of a board state dict (MonopolyBoard.to_dict(), e.g. player_engine's mirror)."""
+        view = cls(template)
+        for kind in PROPERTY_KINDS:
+            for prop in state[kind]:
+                if prop["owner"] is not None:
+                    view.own(prop["position"], prop["owner"], prop.get("house_count", 0), prop.get("mortgaged", False))
+        for player in state["players"]:
+            view.players[player["name"]] = player
+        return view
+
+    @classmethod
+    def from_board(cls, board, template: Optional[BoardTemplate] = None) -> "BoardView":
+        """View of a live MonopolyBoard, without serializing it."""
+        view = cls(template)
+        for properties in (board.regular_properties, board.railroad_properties, board.utility_properties):
+            for prop in properties:
+                if prop.owner is not None:
+                    view.own(prop.position, prop.owner, getattr(prop, "house_count", 0), prop.mortgaged)
+        for player in board.players:
+            view.seat(player.name, player.money, player.position, player.in_jail,
+                      player.get_out_of_jail_free, player.bankrupt)
+        return view
+
+
+class HeuristicPolicy:
+    """
+    Local decisions scored by expected rent per turn.
+
+    A property's income is its landing probability times its rent, times the number
+    of opponents who may land on it. Purchases are worth the income they add to their
+    group over INCOME_HORIZON turns, plus part of a street group's developed income
+    while no opponent holds any of it, plus the rent they stop an opponent from
+    charging by completing a group; half the price is the cost, since a mortgage
+    gets the other half back. Houses are built where rent per dollar is highest.
+    Nothing is bought or built that would leave less cash than the reserve:
+    RUNWAY_TURNS turns of the rent expected to be owed to opponents.
+    """
+
+    def __init__(self, template: Optional[BoardTemplate] = None, horizon: int = INCOME_HORIZON,
+                 runway_turns: int = RUNWAY_TURNS):
+        self.template = template or board_template()
+        self.horizon = horizon
+        self.runway_turns = runway_turns
+
+    @staticmethod
+    def opponents(view: BoardView, player: str) -> int:
+        return max(1, sum(1 for p in view.players.values() if p["name"] != player and not p["bankrupt"]))
+
+    def _rent(self, view: BoardView, position: int) -> int:
+        """Rent an owned 'position' charges now."""
+        t = self.template
+        if position in view.mortgaged:
+            return 0
+        held = view.counts[(view.owner[position], t.group[position])]
+        return t.rent(position, held, view.houses.get(position, 0))
+
+    def group_income(self, view: BoardView, owner: str, group: str, extra: Optional[int] = None) -> float:
+        """Expected rent per opponent turn from owner's properties in 'group', also owning 'extra' if given."""
+        t = self.template
+        held = view.counts.get((owner, group), 0) + (extra is not None)
+        income = 0.0
+        for position in t.members[group]:
+            if position == extra or (view.owner.get(position) == owner and position not in view.mortgaged):
+                income += t.landing[position] * t.rent(position, held, view.houses.get(position, 0))
+        return income
+
+    def exposure(self, view: BoardView, player: str, landing: Optional[list] = None) -> float:
+        """Expected rent 'player' pays per turn (or on the turn whose landing distribution is given)."""
+        landing = landing or self.template.landing
+        exposure = 0.0
+        for position, owner in view.owner.items():
+            if owner != player:
+                exposure += landing[position] * self._rent(view, position)
+        return exposure
+
+    def reserve(self, view: BoardView, player: str) -> int:
+        """Cash to keep back: RUNWAY_TURNS turns of expected rent, and at least MIN_RESERVE."""
+        return max(MIN_RESERVE, int(self.runway_turns * self.exposure(view, player)))
+
+    def purchase_value(self, view: BoardView, player: str, position: int) -> float:
+        """Expected gain from buying 'position' over the horizon, net of what the money costs."""
+        t = self.template
+        group = t.group[position]
+        members = t.members[group]
+        opponents = self.opponents(view, player)
+        per_turn = (self.group_income(view, player, group, position) - self.group_income(view, player, group)) * opponents
+
+        rivals = {view.owner[p] for p in members if view.owner.get(p) not in (None, player)}
+        developed = (sum(t.landing[p] * t.rents[p][DEVELOPED_LEVEL] for p in members)
+                     if position in t.streets else 0.0)
+        if not rivals:
+            held = view.counts.get((player, group), 0)
+            share = ((held + 1) ** 2 - held ** 2) / len(members) ** 2
+            per_turn += DEVELOPMENT_WEIGHT * developed * share * opponents
+        for rival in rivals:
+            # Rent we would owe the rival if it got this one too
+            blocked = self.group_income(view, rival, group, position) - self.group_income(view, rival, group)
+            if view.counts[(rival, group)] == len(members) - 1:
+                blocked += DEVELOPMENT_WEIGHT * developed
+            per_turn += blocked
+        return per_turn * self.horizon - t.price[position] / 2
+
+    def should_buy(self, view: BoardView, player: str, position: int, cash: Optional[int] = None,
+                   reserve: Optional[int] = None) -> bool:
+        """Buy 'position' if it is worth its cost and leaves the reserve (out of 'cash', or the player's money)."""
+        if cash is None:
+            cash = view.players[player]["money"]
+        if reserve is None:
+            reserve = self.reserve(view, player)
+        return cash - self.template.price[position] >= reserve and self.purchase_value(view, player, position) > 0
+
+    def house_options(self, view: BoardView, player: str) -> list[int]:
+        """Positions 'player' may build on, by the monopoly and even-building rules."""
+        t = self.template
+        options = []
+        for group, members in t.members.items():
+            if members[0] not in t.streets or view.counts.get((player, group), 0) != len(members):
+                continue
+            fewest = min(view.houses.get(position, 0) for position in members)
+            if fewest < 5:
+                options.extend(position for position in members if view.houses.get(position, 0) == fewest)
+        return options
+
+    def build_value(self, view: BoardView, player: str, position: int) -> float:
+        """
+        Income per dollar per turn of the next house on 'position'. Below three
+        houses it is averaged over the houses up to three, where rents jump.
+        """
+        t = self.template
+        houses = view.houses.get(position, 0)
+        target = max(houses + 1, 3)
+        rents = t.rents[position]
+        gain = t.landing[position] * (rents[1 + target] - rents[1 + houses]) * self.opponents(view, player)
+        return gain / (t.house_cost[position] * (target - houses))
+
+    def plan_builds(self, view: BoardView, player: str, limit: int = 3, options: Optional[list[int]] = None) -> list[int]:
+        """
+        Up to 'limit' houses to build, best first, that pay for themselves over the
+        horizon and leave the reserve. 'options' limits the choice to those positions.
+        """
+        t = self.template
+        cash = view.players[player]["money"]
+        reserve = self.reserve(view, player)
+        saved = view.houses
+        view.houses = dict(saved)
+        builds = []
+        try:
+            for _ in range(limit):
+                candidates = [position for position in self.house_options(view, player)
+                              if options is None or position in options]
+                if not candidates:
+                    break
+                best = max(candidates, key=lambda position: self.build_value(view, player, position))
+                cost = t.house_cost[best]
+                if cash - cost < reserve or self.build_value(view, player, best) * self.horizon < 1:
+                    break
+                builds.append(best)
+                cash -= cost
+                view.houses[best] = view.houses.get(best, 0) + 1
+        finally:
+            view.houses = saved
+        return builds
+
+    def jail_action(self, view: BoardView, player: str) -> str:
+        """
+        'use_card', 'pay_fine' or 'roll'. Leaving is worth the chance of landing on
+        something to buy, less the rent expected on the way; late in the game that
+        is negative and it is safer to sit in jail and roll.
+        """
+        t = self.template
+        me = view.players[player]
+        if not me["in_jail"]:
+            return "roll"
+        landing = t.next_landing[t.jail_position]
+        opportunity = sum(landing[position] * price for position, price in t.price.items()
+                          if position not in view.owner)
+        value = OPPORTUNITY_SHARE * opportunity - self.exposure(view, player, landing)
+        if value <= 0:
+            return "roll"
+        if me["get_out_of_jail_free"] > 0:
+            return "use_card"
+        if value > JAIL_FINE and me["money"] - JAIL_FINE >= self.reserve(view, player):
+            return "pay_fine"
+        return "roll"
+
+    def choose_mortgages(self, view: BoardView, player: str, need: int) -> list[int]:
+        """Positions to mortgage to raise 'need', giving up the least income per dollar raised."""
+        t = self.template
+        candidates = []
+        for position, owner in view.owner.items():
+            if owner != player or position in view.mortgaged:
+                continue
+            # Streets in a group with houses cannot be mortgaged
+            if any(view.houses.get(member, 0) for member in t.members[t.group[position]]):
+                continue
+            candidates.append((t.landing[position] * self._rent(view, position) / (t.price[position] // 2), position))
+        candidates.sort()
+        chosen, raised = [], 0
+        for _, position in candidates:
+            if raised >= need:
+                break
+            chosen.append(position)
+            raised += t.price[position] // 2
+        return chosen
+
+    def plan_turn(self, view: BoardView, player: str) -> dict:
+        """A /turn plan: builds before the roll, a jail action, which landing spaces to buy and the reserve."""
+        t = self.template
+        me = view.players[player]
+        reserve = self.reserve(view, player)
+        builds = self.plan_builds(view, player)
+        jail_action = self.jail_action(view, player)
+        cash = me["money"] - sum(t.house_cost[position] for position in builds)
+        landing = t.next_landing_from_jail if me["in_jail"] else t.next_landing[me["position"]]
+        buy = sorted(position for position in t.price
+                     if landing[position] > 0 and position not in view.owner
+                     and self.should_buy(view, player, position, cash, reserve))
+        return {
+            "build_before": builds,
+            "jail_action": None if jail_action == "roll" else jail_action,
+            "buy": buy,
+            "cash_reserve": reserve,
+            "build_after": [],
+        }
+
+
+@functools.cache
+def default_policy() -> HeuristicPolicy:
+    """The process-wide HeuristicPolicy with the default settings."""
+    return HeuristicPolicy()
+
+
 class AIPlayer(Player):
     """
     AI Player that uses ChatGPT to make decisions through the ai.thewcl.com server.
     """
     
     def __init__(self, name: str, token: str, api_key: Optional[str] = None, 
-                 server_url: str = "http://ai.thewcl.com:6502"):
+                 server_url: str = AI_SERVER_URL,
+                 cache: Optional[DecisionCache] = None, ai_client: Optional[AIClient] = None,
+                 policy: Optional[HeuristicPolicy] = None):
         super().__init__(name, token)
         self.api_key = api_key or os.getenv('OPENAI_API_KEY')
         self.server_url = server_url
+        self.ai_client = ai_client or get_ai_client(server_url, self.api_key)
+        self.decision_cache = cache if cache is not None else decision_cache
+        self.policy = policy or default_policy()
         self.is_ai = True
         self.decision_history = []
         
         if not self.api_key:
             raise ValueError("OpenAI API key must be provided via parameter or OPENAI_API_KEY environment variable")
     
-    def _make_api_request(self, prompt: str, system_prompt: str = None) -> str:
+    async def _make_api_request(self, prompt: str, system_prompt: str = None, max_tokens: int = 300) -> Optional[str]:
         """
         Make a request to the ChatGPT API through the ai.thewcl.com server.
         
         Args:
             prompt: The user prompt for ChatGPT
             system_prompt: Optional system prompt to set context
+            max_tokens: Longest reply to allow
             
         Returns:
-            str: The AI's response
+            Optional[str]: The AI's response, or None if it did not answer within the
+            client's budget (or the request failed)
         """
+        payload = {
+            "model": "gpt-4",
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt or "You are an AI playing Monopoly. Make strategic decisions based on the game state."
+                },
+                {
+                    "role": "user", 
+                    "content": prompt
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": 0.7,
+            "api_key": self.api_key
+        }
+        
+        result = await self.ai_client.post("/chat/completions", payload)
+        if result is None:
+            return None
         try:
-            payload = {
-                "model": "gpt-4",
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt or "You are an AI playing Monopoly. Make strategic decisions based on the game state."
-                    },
-                    {
-                        "role": "user", 
-                        "content": prompt
-                    }
-                ],
-                "max_tokens": 300,
-                "temperature": 0.7,
-                "api_key": self.api_key
-            }
-            
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {self.api_key}"
-            }
-            
-            response = requests.post(
-                f"{self.server_url}/chat/completions",
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result["choices"][0]["message"]["content"].strip()
-            else:
-                print(f"API Error: {response.status_code} - {response.text}")
-                return "I need to think about this more carefully."
-                
-        except Exception as e:
-            print(f"Error making API request: {e}")
-            return "I'll make a conservative choice."
+            return result["choices"][0]["message"]["content"].strip()
+        except (KeyError, IndexError, TypeError, AttributeError):
+            print(f"Unexpected API response: {result}")
+            return None
+    
+    async def _decide(self, prompt: str, system_prompt: str, schema: DecisionSchema, context: Any = None,
+                      cache_key: Optional[tuple] = None) -> Optional[dict]:
+        """Get a decision in 'schema's JSON format (see ai_decisions.structured_decision), or None."""
+        return await structured_decision(
+            lambda prompt, max_tokens: self._make_api_request(prompt, system_prompt, max_tokens),
+            prompt, schema, context, self.decision_cache, cache_key,
+        )
+    
+    def _board_view(self, game_state: GameState) -> BoardView:
+        """What the fallback policy can tell from a GameState: cash, positions and who owns which named property."""
+        template = self.policy.template
+        view = BoardView(template)
+        view.seat(self.name, game_state.money, game_state.board_position, self.in_jail, self.get_out_of_jail_free)
+        for name in game_state.properties:
+            if name in template.position_of:
+                view.own(template.position_of[name], self.name)
+        for player in game_state.other_players:
+            view.seat(player['name'], player.get('money', 0))
+            for name in player.get('properties', []):
+                if isinstance(name, str) and name in template.position_of:
+                    view.own(template.position_of[name], player['name'])
+        return view
     
     def _format_game_state(self, game_state: GameState) -> str:
         """Format game state into a readable prompt for ChatGPT."""
@@ -122,7 +521,7 @@ OTHER PLAYERS:
         
         return prompt
     
-    def decide_purchase(self, property_info: Dict[str, Any], game_state: GameState) -> bool:
+    async def decide_purchase(self, property_info: Dict[str, Any], game_state: GameState) -> bool:
         """
         Use ChatGPT to decide whether to purchase a property.
         
@@ -134,8 +533,7 @@ OTHER PLAYERS:
             bool: True if AI decides to purchase, False otherwise
         """
         system_prompt = """You are an expert Monopoly player. Analyze the game state and decide whether to purchase the offered property. 
-        Consider: property value, rent potential, color group completion, cash flow, and strategic position.
-        Respond with either 'YES' or 'NO' followed by a brief explanation."""
+        Consider: property value, rent potential, color group completion, cash flow, and strategic position."""
         
         game_prompt = self._format_game_state(game_state)
         property_prompt = f"""
@@ -149,22 +547,34 @@ Should I purchase this property?
 """
         
         full_prompt = game_prompt + property_prompt
-        response = self._make_api_request(full_prompt, system_prompt)
-        
-        # Parse the response
-        decision = response.upper().startswith('YES')
+        color_group = property_info.get('color_group')
+        group_owned = sum(1 for prop in self.properties
+                          if color_group is not None and getattr(prop, 'color', None) == color_group)
+        # The prompt does not say who owns the rest of the group, so neither does the key
+        cache_key = purchase_key(property_info['name'], property_info['price'], game_state.money, group_owned)
+        reply = await self._decide(full_prompt, system_prompt, PURCHASE, cache_key=cache_key)
+        
+        position = self.policy.template.position_of.get(property_info['name'])
+        if reply is None and position is not None:
+            # No valid answer in time: ask the local policy
+            decision = self.policy.should_buy(self._board_view(game_state), self.name, position, game_state.money)
+        elif reply is None:
+            # Not a property on the standard board: buy if it is $200 or less and we can afford it
+            decision = property_info['price'] <= 200 and property_info['price'] <= game_state.money
+        else:
+            decision = reply['buy']
         
         # Log the decision
         self.decision_history.append({
             'type': 'purchase',
             'property': property_info['name'],
             'decision': decision,
-            'reasoning': response
+            'reply': reply
         })
         
         return decision
     
-    def decide_jail_action(self, game_state: GameState) -> str:
+    async def decide_jail_action(self, game_state: GameState) -> str:
         """
         Use ChatGPT to decide jail action: 'pay', 'roll', or 'card'.
         
@@ -177,9 +587,7 @@ Should I purchase this property?
         system_prompt = """You are in jail in Monopoly. Decide the best action:
         - 'pay': Pay $50 fine to get out immediately
         - 'roll': Try to roll doubles (free, but might stay in jail)
-        - 'card': Use Get Out of Jail Free card (if available)
-        
-        Respond with only the action word followed by brief reasoning."""
+        - 'card': Use Get Out of Jail Free card (if available)"""
         
         game_prompt = self._format_game_state(game_state)
         jail_prompt = f"""
@@ -192,27 +600,27 @@ What action should I take?
 """
         
         full_prompt = game_prompt + jail_prompt
-        response = self._make_api_request(full_prompt, system_prompt)
-        
-        # Parse response for action
-        response_lower = response.lower()
-        if 'pay' in response_lower:
-            action = 'pay'
-        elif 'card' in response_lower and self.get_out_of_jail_free > 0:
-            action = 'card'
+        cache_key = jail_key(self.jail_turns, self.get_out_of_jail_free > 0, self.money)
+        reply = await self._decide(full_prompt, system_prompt, JAIL_ACTION, self.get_out_of_jail_free, cache_key)
+        
+        if reply is None:
+            # No valid answer in time: ask the local policy
+            view = self._board_view(game_state)
+            view.players[self.name]['in_jail'] = True
+            action = JAIL_ACTIONS[self.policy.jail_action(view, self.name)]
         else:
-            action = 'roll'
+            action = reply['action']
         
         # Log the decision
         self.decision_history.append({
             'type': 'jail_action',
             'action': action,
-            'reasoning': response
+            'reply': reply
         })
         
         return action
     
-    def decide_trade(self, trade_offer: Dict[str, Any], game_state: GameState) -> bool:
+    async def decide_trade(self, trade_offer: Dict[str, Any], game_state: GameState) -> bool:
         """
         Use ChatGPT to decide whether to accept a trade offer.
         
@@ -224,8 +632,7 @@ What action should I take?
             bool: True if AI accepts the trade, False otherwise
         """
         system_prompt = """You are evaluating a trade offer in Monopoly. Consider property values, 
-        monopoly potential, cash flow, and strategic advantages. 
-        Respond with 'ACCEPT' or 'REJECT' followed by reasoning."""
+        monopoly potential, cash flow, and strategic advantages."""
         
         game_prompt = self._format_game_state(game_state)
         trade_prompt = f"""
@@ -238,22 +645,22 @@ Should I accept this trade?
 """
         
         full_prompt = game_prompt + trade_prompt
-        response = self._make_api_request(full_prompt, system_prompt)
+        reply = await self._decide(full_prompt, system_prompt, TRADE)
         
-        # Parse the response
-        decision = response.upper().startswith('ACCEPT')
+        # No valid answer in time rejects the trade
+        decision = reply is not None and reply['accept']
         
         # Log the decision
         self.decision_history.append({
             'type': 'trade',
             'offer': trade_offer,
             'decision': decision,
-            'reasoning': response
+            'reply': reply
         })
         
         return decision
     
-    def decide_mortgage_action(self, financial_need: int, game_state: GameState) -> List[str]:
+    async def decide_mortgage_action(self, financial_need: int, game_state: GameState) -> List[str]:
         """
         Use ChatGPT to decide which properties to mortgage when needing cash.
         
@@ -266,7 +673,7 @@ Should I accept this trade?
         """
         system_prompt = """You need to raise money in Monopoly by mortgaging properties. 
         Choose which properties to mortgage to meet your financial needs while maintaining 
-        the best strategic position. List property names to mortgage."""
+        the best strategic position."""
         
         game_prompt = self._format_game_state(game_state)
         mortgage_prompt = f"""
@@ -279,24 +686,26 @@ Available properties to mortgage:
         for prop in self.properties:
             mortgage_prompt += f"- {getattr(prop, 'name', 'Unknown')}: Mortgage value ${getattr(prop, 'mortgage_value', 0)}\n"
         
-        mortgage_prompt += "\nWhich properties should I mortgage? List them by name."
+        mortgage_prompt += "\nWhich properties should I mortgage?"
         
         full_prompt = game_prompt + mortgage_prompt
-        response = self._make_api_request(full_prompt, system_prompt)
-        
-        # Parse property names from response
-        property_names = []
-        for prop in self.properties:
-            prop_name = getattr(prop, 'name', '')
-            if prop_name.lower() in response.lower():
-                property_names.append(prop_name)
+        owned = {getattr(prop, 'name', '') for prop in self.properties}
+        reply = await self._decide(full_prompt, system_prompt, MORTGAGE, owned)
+        
+        if reply is None:
+            # No valid answer in time: mortgage what earns the least per dollar raised
+            positions = self.policy.choose_mortgages(self._board_view(game_state), self.name, financial_need)
+            property_names = [self.policy.template.name[position] for position in positions
+                              if self.policy.template.name[position] in owned]
+        else:
+            property_names = reply['mortgage']
         
         # Log the decision
         self.decision_history.append({
             'type': 'mortgage',
             'need': financial_need,
             'properties': property_names,
-            'reasoning': response
+            'reply': reply
         })
         
         return property_names
@@ -9,10 +9,12 @@ import threading
 import requests
 import random
 import time
+from state_diff import StateMirror
 
-# WebSocket URL
-WS_URL = "ws://ai.thewcl.com:8703"
 API_URL = "http://localhost:8000"
+# The game server pushes state changes over a per-game WebSocket
+WS_URL = API_URL.replace("http", "ws", 1)
+GAME_ID = "default"
 
 class MonopolyUI:
     def __init__(self, root):
@@ -26,6 +28,9 @@ class MonopolyUI:
         self.dice_values = (1, 1)
         self.board_positions = []
         self.game_state = {}
+        # Local copy of the game state, kept current from snapshots and patches
+        self.mirror = StateMirror()
+        self.state_etag = None
         
         # Initialize board positions (40 spaces in Monopoly)
         self.init_board_positions()
@@ -450,50 +455,25 @@ class MonopolyUI:
         def poll_game_state():
             while True:
                 try:
-                    # Get game state from API
-                    response = requests.get(f"{API_URL}/state", timeout=5)
+                    # Once the board is up, updates arrive over the WebSocket
+                    if self.game_started and self.websocket:
+                        time.sleep(2)
+                        continue
+                    
+                    # Ask only for what changed since the state we already have; the
+                    # static board is not needed (space names are in board_spaces)
+                    since = self.mirror.version
+                    params = {"view": "dynamic"}
+                    if since is not None:
+                        params["since"] = since
+                        params["epoch"] = self.mirror.epoch
+                    headers = {"If-None-Match": self.state_etag} if self.state_etag and since is not None else None
+                    response = requests.get(f"{API_URL}/games/{GAME_ID}/state", params=params, headers=headers, timeout=5)
+                    # 304 Not Modified: nothing changed since our copy
                     if response.status_code == 200:
-                        game_data = response.json()
-                        
-                        # Check if game board should be shown (game has been properly reset)
-                        # Game is ready when it has players AND properties (properties are only created during reset)
-                        if (game_data.get('players') and 
-                            len(game_data['players']) >= 2 and
-                            game_data.get('regular_properties') and 
-                            len(game_data['regular_properties']) > 0):
-                            
-                            if not self.game_started:
-                                # Game properly configured, switch to game screen
-                                self.game_started = True
-                                self.root.after(0, self.setup_game_screen)
-                                self.root.after(0, lambda: self.log_message("Game board loaded! Game configured with players."))
-                            
-                            # Update game display
-                            self.root.after(0, lambda: self.update_game_display(game_data))
-                        else:
-                            # Game hasn't been properly configured yet, update waiting screen status
-                            num_players = len(game_data.get('players', []))
-                            has_properties = bool(game_data.get('regular_properties'))
-                            
-                            if num_players > 0 and has_properties:
-                                status_text = f"Game configured with {num_players} players. Ready to play!"
-                                # Show player names if available
-                                if game_data.get('players'):
-                                    player_names = [p['name'] for p in game_data['players']]
-                                    status_text += f"\nPlayers: {', '.join(player_names)}"
-                            elif num_players > 0:
-                                status_text = f"Found {num_players} players, but game needs to be reset first."
-                            else:
-                                status_text = "Waiting for game to start..."
-                            
-                            if hasattr(self, 'status_label'):
-                                self.root.after(0, lambda: self.status_label.config(text=status_text))
-                            
-                            # Update progress
-                            current_time = time.strftime("%H:%M:%S")
-                            progress_text = f"Last checked: {current_time}"
-                            if hasattr(self, 'progress_label'):
-                                self.root.after(0, lambda: self.progress_label.config(text=progress_text))
+                        self.state_etag = response.headers.get("ETag")
+                        message = response.json() if since is not None else {"state": response.json()}
+                        self.root.after(0, lambda message=message: self.apply_state_message(message))
                     
                     time.sleep(2)  # Poll every 2 seconds
                     
@@ -503,13 +483,65 @@ class MonopolyUI:
         
         polling_thread = threading.Thread(target=poll_game_state, daemon=True)
         polling_thread.start()
+    
+    def apply_state_message(self, message):
+        """Apply a snapshot or patch to the local game state (on the main thread) and show it"""
+        if not self.mirror.apply(message):
+            # Missed a change; get a fresh snapshot
+            self.mirror.state = None
+            self.request_game_state()
+            return
+        self.show_game_state(self.mirror.state)
+    
+    def show_game_state(self, game_data):
+        """Switch to the game screen once the game is configured, otherwise update the waiting screen"""
+        # Check if game board should be shown (game has been properly reset)
+        # Game is ready when it has players AND properties (properties are only created during reset)
+        if (game_data.get('players') and 
+            len(game_data['players']) >= 2 and
+            game_data.get('regular_properties') and 
+            len(game_data['regular_properties']) > 0):
+            
+            if not self.game_started:
+                # Game properly configured, switch to game screen
+                self.game_started = True
+                self.setup_game_screen()
+                self.log_message("Game board loaded! Game configured with players.")
+            
+            # Update game display
+            self.update_game_display(game_data)
+        else:
+            # Game hasn't been properly configured yet, update waiting screen status
+            num_players = len(game_data.get('players', []))
+            has_properties = bool(game_data.get('regular_properties'))
+            
+            if num_players > 0 and has_properties:
+                status_text = f"Game configured with {num_players} players. Ready to play!"
+                # Show player names if available
+                if game_data.get('players'):
+                    player_names = [p['name'] for p in game_data['players']]
+                    status_text += f"\nPlayers: {', '.join(player_names)}"
+            elif num_players > 0:
+                status_text = f"Found {num_players} players, but game needs to be reset first."
+            else:
+                status_text = "Waiting for game to start..."
+            
+            if hasattr(self, 'status_label'):
+                self.status_label.config(text=status_text)
+            
+            # Update progress
+            current_time = time.strftime("%H:%M:%S")
+            progress_text = f"Last checked: {current_time}"
+            if hasattr(self, 'progress_label'):
+                self.progress_label.config(text=progress_text)
 
     async def websocket_listener(self):
         """Listen for WebSocket messages and update UI"""
         try:
-            async with websockets.connect(WS_URL) as websocket:
+            ws_url = f"{WS_URL}/games/{GAME_ID}/ws"
+            async with websockets.connect(ws_url) as websocket:
                 self.websocket = websocket
-                print(f"Connected to WebSocket at {WS_URL}")
+                print(f"Connected to WebSocket at {ws_url}")
                 
                 # Schedule UI update on main thread
                 self.root.after(0, lambda: self.log_message("Connected to game server!"))
@@ -524,7 +556,14 @@ class MonopolyUI:
                             game_data = data.get("data")
                             if game_data:
                                 # Schedule UI update on main thread
-                                self.root.after(0, lambda: self.update_game_display(game_data))
+                                self.root.after(0, lambda game_data=game_data: self.apply_state_message({"state": game_data}))
+                        
+                        elif data.get("type") == "game_state_patch":
+                            self.root.after(0, lambda data=data: self.apply_state_message(data))
+                        
+                        elif data.get("type") == "game_deleted":
+                            # Versions restart if the game is recreated; forget the old state
+                            self.root.after(0, lambda data=data: self.mirror.apply(data))
                         
                         elif "positions" in data:
                             # Handle position updates from player_engine
@@ -545,8 +584,15 @@ class MonopolyUI:
             error_msg = f"WebSocket error: {str(e)}"
             print(error_msg)
             self.root.after(0, lambda: self.log_message(error_msg))
+        finally:
+            # Fall back to polling
+            self.websocket = None
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Monopoly Game UI")
+    parser.add_argument("--game", default="default", help="Id of the game to watch.")
+    GAME_ID = parser.parse_args().game
+    
     root = tk.Tk()
     app = MonopolyUI(root)
     root.mainloop()
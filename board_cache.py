@@ -0,0 +1,107 @@
+'''
+board_cache.py
+
+Per-process cache of hydrated MonopolyBoard objects, so API requests do not have to
+fetch and rebuild the whole game from Redis every time.
+'''
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class CachedBoard:
+    """
+    A board at one (epoch, version) plus its to_dict() snapshot, and the snapshot's
+    encoded JSON per response view, filled in as requests need them.
+
+    All are shared between requests and must be treated as read-only; mutations
+    work on board.clone() and put the result back.
+    """
+    epoch: str
+    version: int
+    board: Any
+    snapshot: dict
+    last_used: float
+    encoded: dict = field(default_factory=dict)
+
+    def encode(self, view: str, render) -> bytes:
+        """Return the snapshot rendered by render(snapshot) -> bytes, cached under 'view'."""
+        body = self.encoded.get(view)
+        if body is None:
+            body = self.encoded[view] = render(self.snapshot)
+        return body
+
+
+class BoardCache:
+    """
+    LRU cache of boards keyed by game id, each entry valid for exactly one version
+    of one epoch (a game that is deleted and recreated starts a new epoch, and its
+    versions count from 1 again).
+
+    Callers look up the (epoch, version) currently stored in Redis (a cheap JSON.GET
+    of $.epoch and $.version) and ask for that; an entry for anything else is a miss.
+    Entries unused for idle_ttl seconds are dropped, and at most max_games are kept.
+    Thread-safe, so sync code and the server's event loop can share one cache.
+    """
+
+    def __init__(self, max_games: int = 1024, idle_ttl: float = 600.0):
+        self.max_games = max_games
+        self.idle_ttl = idle_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[str, CachedBoard] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, game_id: str, epoch: str, version: int) -> Optional[CachedBoard]:
+        """Return the cached board for game_id if it is at 'version' of 'epoch', else None."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if (entry is None or entry.epoch != epoch or entry.version != version
+                    or now - entry.last_used > self.idle_ttl):
+                self.misses += 1
+                return None
+            entry.last_used = now
+            self._entries.move_to_end(game_id)
+            self.hits += 1
+            return entry
+
+    def put(self, game_id: str, board: Any, snapshot: dict) -> CachedBoard:
+        """Cache a board (write-through after a commit, or after a full load)."""
+        now = time.monotonic()
+        entry = CachedBoard(board.epoch, board.version, board, snapshot, now)
+        with self._lock:
+            current = self._entries.get(game_id)
+            # Never replace a newer version with an older one from a slow reader
+            if current is not None and current.epoch == entry.epoch and current.version > entry.version:
+                return entry
+            self._entries[game_id] = entry
+            self._entries.move_to_end(game_id)
+            self._evict(now)
+        return entry
+
+    def invalidate(self, game_id: str, version: Optional[int] = None):
+        """Drop a game's entry, or only an entry older than 'version' if one is given."""
+        with self._lock:
+            entry = self._entries.get(game_id)
+            if entry is not None and (version is None or entry.version < version):
+                del self._entries[game_id]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _evict(self, now: float):
+        while self._entries:
+            game_id, oldest = next(iter(self._entries.items()))
+            if len(self._entries) > self.max_games or now - oldest.last_used > self.idle_ttl:
+                del self._entries[game_id]
+            else:
+                break
+
+    def __len__(self) -> int:
+        return len(self._entries)
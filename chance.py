@@ -4,7 +4,7 @@ from typing import List
 #from game import Game, Player
 
 # —————— Data Model ——————
-@dataclass
+@dataclass(slots=True)
 class ChanceCard:
     name: str
     description: str
@@ -38,8 +38,8 @@ class ChanceDeck:
     cards: List[ChanceCard] = field(default_factory=build_chance_deck)
 
     
-    def shuffle_deck(self) -> None:
-        random.shuffle(self.cards)
+    def shuffle_deck(self, rng=random) -> None:
+        rng.shuffle(self.cards)
 
     def draw_card(self) -> tuple[ChanceCard, bool]:
         """Draw a card from the deck. Returns (card, keep_card)"""
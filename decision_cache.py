@@ -0,0 +1,125 @@
+'''
+decision_cache.py
+
+Cache of AI decisions keyed on what the decision depends on (the property, its price,
+the player's cash and who owns the rest of its group) instead of the prompt text, so
+the model is only asked questions it has not already answered in a similar position.
+'''
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+# Width of the price and cash ranges treated as the same situation
+PRICE_BUCKET = 50
+CASH_BUCKET = 100
+
+
+def bucket(amount: int, size: int) -> int:
+    """Round 'amount' down to a multiple of 'size', e.g. bucket(1370, 100) -> 1300."""
+    return amount // size * size
+
+
+def purchase_key(property_name: str, price: int, cash: int, group_owned: int = 0,
+                 group_owned_by_others: Optional[int] = None) -> tuple:
+    """
+    Key for "should I buy this property?". group_owned is how many other properties
+    of its color group (or railroads, or utilities) the player owns, and
+    group_owned_by_others how many opponents own (None if the caller cannot tell).
+    """
+    return ("purchase", property_name, bucket(price, PRICE_BUCKET), bucket(cash, CASH_BUCKET),
+            group_owned, group_owned_by_others)
+
+
+def house_key(options: list[dict], cash: int) -> tuple:
+    """Key for "which of these houses should I buy?", given house_options entries in order."""
+    return ("house", tuple((option["position"], option["house_count"]) for option in options),
+            bucket(cash, CASH_BUCKET))
+
+
+def turn_key(options: list[dict], reachable: list[tuple], cash: int, jail: tuple) -> tuple:
+    """
+    Key for a whole turn plan: the builds on offer, the unowned properties the roll
+    could reach as (position, group owned, group owned by others) and the jail
+    situation as (in jail, turns there, has a card).
+    """
+    return ("turn", tuple((option["position"], option["house_count"]) for option in options),
+            tuple(reachable), bucket(cash, CASH_BUCKET), jail)
+
+
+def jail_key(jail_turns: int, has_card: bool, cash: int) -> tuple:
+    """Key for "how should I get out of jail?"."""
+    return ("jail", jail_turns, has_card, bucket(cash, CASH_BUCKET))
+
+
+class DecisionCache:
+    """
+    LRU cache of AI responses keyed by tuples such as purchase_key(...).
+
+    Entries older than ttl seconds are treated as missing, and at most max_entries
+    are kept in memory. With a path, entries are also written to a SQLite file there,
+    so processes sharing the file reuse each other's decisions. Thread-safe.
+    """
+
+    def __init__(self, max_entries: int = 4096, ttl: float = 86400.0, path: Optional[str] = None):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[tuple, tuple[str, float]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS decisions (key TEXT PRIMARY KEY, value TEXT NOT NULL, stored REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def get(self, key: tuple) -> Optional[str]:
+        """Return the cached response for 'key', or None if there is no fresh one."""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None and self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, stored FROM decisions WHERE key = ?", (json.dumps(key),)
+                ).fetchone()
+                if row is not None:
+                    entry = self._entries[key] = (row[0], row[1])
+            if entry is None or now - entry[1] > self.ttl:
+                self._entries.pop(key, None)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: tuple, value: str):
+        now = time.time()
+        with self._lock:
+            self._entries[key] = (value, now)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO decisions (key, value, stored) VALUES (?, ?, ?)",
+                    (json.dumps(key), value, now),
+                )
+                self._db.execute("DELETE FROM decisions WHERE stored < ?", (now - self.ttl,))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM decisions")
+                self._db.commit()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,14 +1,16 @@
-from dataclasses import dataclass   
+from dataclasses import dataclass, field
+from typing import Any
 import random
 
-@dataclass
+@dataclass(slots=True)
 class Die:
+    rng: Any = field(default=random, repr=False)  # anything with randint(), e.g. random.Random(seed)
     
     def roll(self):
         ''' Returns a random integer between 1 and 6 '''
-        return random.randint(1, 6)
+        return self.rng.randint(1, 6)
     
-@dataclass
+@dataclass(slots=True)
 class DieSet:
     die1: Die
     die2: Die
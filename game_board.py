@@ -1,9 +1,20 @@
-from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect
+from fastapi import APIRouter, Depends, FastAPI, HTTPException, Request, Response, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-from dataclasses import dataclass, field, asdict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Literal, Optional
 import redis
+import redis.asyncio as aioredis
 from redis.commands.json.path import Path
+import asyncio
+import functools
+import hashlib
 import json
+import os
+import random
+import re
+import uuid
+import weakref
 import ipdb
 import subprocess
 from properties import RegularProperty, RailroadProperty, UtilityProperty, ChestChanceSpace, SpecialSpace
@@ -11,9 +22,297 @@ from dice import Die, DieSet
 from player import Player
 from chest import ChestDeck, ChestCard
 from chance import ChanceDeck, ChanceCard
+from state_diff import diff, diff_paths, json_path, patch_from_diff
+from board_cache import BoardCache
+
+REDIS_SETTINGS = {"host": "ai.thewcl.com", "port": 6379, "db": 3, "password": "atmega328"}
+# Connections shared by all API requests; requests wait for a free one when it is exhausted
+REDIS_POOL_SIZE = int(os.getenv("MONOPOLY_REDIS_POOL_SIZE", "64"))
+REDIS_POOL_TIMEOUT = 10
+_redis = None
+_async_redis = None
+GAMES_KEY = "monopoly:games"  # set of hosted game ids
+DEFAULT_GAME_ID = "default"
+BOARD_SIZE = 40
+
+
+try:
+    import orjson
+except ImportError:
+    # Optional; the standard library encoder is used without it
+    orjson = None
+
+
+def encode_json(content) -> bytes:
+    """Compact JSON bytes for plain dicts, lists and scalars (via orjson when installed)."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered by encode_json. Handlers returning one directly skip
+    FastAPI's jsonable_encoder pass; bytes content is sent as already-encoded JSON.
+    """
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return content if isinstance(content, bytes) else encode_json(content)
+
+
+def state_key(game_id: str) -> str:
+    """Redis key holding a game's board (including its decks)."""
+    return f"monopoly:game:{game_id}:state"
+
+
+def journal_key(game_id: str) -> str:
+    """Redis list of a game's recent commits as JSON {"version", "patch"} entries, oldest first."""
+    return f"monopoly:game:{game_id}:journal"
+
+
+def game_channel(game_id: str) -> str:
+    """
+    Pub/sub channel for a game's players. The server publishes every commit on it as
+    a game_state_patch message {"type", "since", "version", "epoch", "patch"}, so subscribers
+    can apply it to their copy of the state instead of fetching it, and sends
+    GAME_DELETED_MESSAGE when the game is deleted.
+    """
+    return f"monopoly:game:{game_id}:changed"
+
+
+# Sent on game_channel and to WebSocket clients when a game is deleted
+GAME_DELETED_MESSAGE = {"type": "game_deleted", "version": 0}
+
+
+def version_channel(game_id: str) -> str:
+    """Pub/sub channel carrying a game's new version after each commit (for board caches)."""
+    return f"monopoly:game:{game_id}:version"
+
+
+def get_redis() -> redis.Redis:
+    """
+    Return the shared blocking Redis client, creating it on first use. Used by
+    MonopolyBoard.save_to_redis/load_from_redis; the API uses get_async_redis().
+    """
+    global _redis
+    if _redis is None:
+        _redis = redis.Redis(**REDIS_SETTINGS)
+    return _redis
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Return the API's non-blocking Redis client (set up by the app lifespan)."""
+    if _async_redis is None:
+        raise RuntimeError("Redis pool not started; run the app through its lifespan")
+    return _async_redis
+
+
+# Serializes mutations of each game within this process, so concurrent requests for
+# one game queue here instead of conflicting in Redis. Unused locks are dropped.
+_game_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+
+def game_lock(game_id: str) -> asyncio.Lock:
+    lock = _game_locks.get(game_id)
+    if lock is None:
+        lock = _game_locks[game_id] = asyncio.Lock()
+    return lock
+
+
+def no_persistence(board: "MonopolyBoard") -> None:
+    """Default save hook: in-memory games are not persisted anywhere."""
+
+
+def save_board_to_redis(board: "MonopolyBoard") -> None:
+    """Save hook that writes every change straight to Redis (no conflict detection)."""
+    board.save_to_redis()
+
+
+class ConcurrentUpdateError(Exception):
+    """Raised when a board mutation keeps losing the race with other writers."""
+
+
+class GameNotFoundError(Exception):
+    """Raised when a game id has no stored board."""
+
+
+MAX_COMMIT_ATTEMPTS = 8
+COMMIT_BACKOFF_SECONDS = 0.005
+COMMIT_BACKOFF_MAX_SECONDS = 0.2
+# Commits kept in each game's journal; clients further behind get a full snapshot
+JOURNAL_LENGTH = 200
+
+# Boards hydrated by this process, shared by the request handlers
+board_cache = BoardCache()
+
+
+async def stored_stamp(client, game_id: str) -> Optional[tuple[str, int]]:
+    """
+    Read the (epoch, version) of a stored game (None if it does not exist). Unlike
+    the version alone, this tells a recreated game apart from the deleted one.
+    """
+    stamp = await client.json().get(state_key(game_id), "$.epoch", "$.version")
+    if not stamp or not stamp["$.version"]:
+        return None
+    return (stamp["$.epoch"] or [""])[0], stamp["$.version"][0]
+
+
+async def cached_board(game_id: str, stamp: Optional[tuple[str, int]] = None):
+    """
+    Return the CachedBoard for the stored version of a game (or the (epoch, version)
+    'stamp', if the caller already read it), loading and caching it on a miss, or
+    None if the game does not exist. The board must not be mutated.
+    """
+    client = get_async_redis()
+    if stamp is None:
+        stamp = await stored_stamp(client, game_id)
+    if stamp is None:
+        return None
+    entry = board_cache.get(game_id, *stamp)
+    if entry is not None:
+        return entry
+    
+    data = await client.json().get(state_key(game_id))
+    if not data:
+        return None
+    board = MonopolyBoard.from_dict(data)
+    board.game_id = game_id
+    return board_cache.put(game_id, board, data)
+
+
+async def journal_since(game_id: str, since: int, epoch: Optional[str],
+                        stamp: Optional[tuple[str, int]] = None) -> Optional[dict]:
+    """
+    Build the delta {"since", "version", "epoch", "patch"} from version 'since' of
+    the game's epoch 'epoch' to the stored version out of the game's journal (the
+    caller may pass the stored (epoch, version) if it already read it). Returns
+    None when the journal no longer reaches back to 'since', the game has been
+    recreated since (its epoch differs) or does not exist; send a snapshot instead.
+    """
+    client = get_async_redis()
+    if stamp is None:
+        stamp = await stored_stamp(client, game_id)
+    if stamp is None or stamp[0] != epoch:
+        return None
+    version = stamp[1]
+    if since > version or version - since > JOURNAL_LENGTH:
+        return None
+    if since == version:
+        return {"since": since, "version": version, "epoch": epoch, "patch": []}
+    
+    patch = []
+    expected = since + 1
+    for raw in await client.lrange(journal_key(game_id), since - version, -1):
+        entry = json.loads(raw)
+        if entry["version"] != expected:
+            return None
+        patch.extend(entry["patch"])
+        expected += 1
+    if expected == since + 1:
+        return None
+    return {"since": since, "version": expected - 1, "epoch": epoch, "patch": patch}
+
+
+async def commit_board(game_id: str, mutation, create: bool = False, with_patch: bool = False):
+    """
+    Apply mutation(board) to a stored game as an optimistic transaction.
+
+    Mutations of one game are serialized by game_lock within this process; across
+    processes, the state key is WATCHed while the board is loaded and mutated. The changed paths
+    and a version bump are then written in one MULTI/EXEC. If another writer got
+    there first, EXEC fails and the whole load-mutate-write cycle is retried with
+    jittered exponential backoff, up to MAX_COMMIT_ATTEMPTS times.
+
+    Only the stored version is read inside the WATCH when board_cache already holds
+    that version; the mutation then runs on a clone of the cached board. A committed
+    board is written through to the cache and its version published on
+    version_channel so other processes drop their stale copy. The commit's patch is
+    published on game_channel in the same transaction.
+
+    The mutation runs on a fresh board each attempt, so it must not have side effects
+    outside the board. Nothing is written if it leaves the board unchanged. With
+    create=True a missing game starts from an empty board (and is registered in
+    GAMES_KEY) instead of raising GameNotFoundError; the new board gets a random
+    epoch, so it is not mistaken for a deleted game of the same id and version.
+
+    Each commit also appends its JSON Patch to the game's journal (trimmed to
+    JOURNAL_LENGTH entries), from which clients are sent deltas.
+
+    Returns:
+        Whatever mutation returned on the attempt that committed. With
+        with_patch=True, a (result, delta) pair, where delta is
+        {"since": v, "version": w, "epoch": e, "patch": [...]} describing the commit.
+
+    Raises:
+        ConcurrentUpdateError: Every attempt conflicted with another writer.
+        GameNotFoundError: The game does not exist and create is False.
+    """
+    client = get_async_redis()
+    key = state_key(game_id)
+    async with game_lock(game_id):
+        for attempt in range(MAX_COMMIT_ATTEMPTS):
+            result = await _try_commit(client, key, game_id, mutation, create)
+            if result is not _CONFLICT:
+                return result if with_patch else result[0]
+            delay = min(COMMIT_BACKOFF_MAX_SECONDS, COMMIT_BACKOFF_SECONDS * 2 ** attempt)
+            await asyncio.sleep(random.uniform(0, delay))
+    
+    raise ConcurrentUpdateError(f"Gave up after {MAX_COMMIT_ATTEMPTS} conflicting updates")
+
+
+_CONFLICT = object()
+
+
+async def _try_commit(client, key: str, game_id: str, mutation, create: bool):
+    """
+    One attempt of commit_board. Returns (mutation result, delta), or _CONFLICT if
+    another writer won the race.
+    """
+    async with client.pipeline() as pipe:
+        try:
+            await pipe.watch(key)
+            stamp = await stored_stamp(pipe, game_id)
+            entry = board_cache.get(game_id, *stamp) if stamp is not None else None
+            if entry is not None:
+                data = entry.snapshot
+                board = entry.board.clone()
+            else:
+                data = await pipe.json().get(key)
+                if not data and not create:
+                    await pipe.unwatch()
+                    raise GameNotFoundError(f"Game {game_id} not found")
+                board = MonopolyBoard.from_dict(data) if data else MonopolyBoard(players=[], epoch=uuid.uuid4().hex[:12])
+                board.game_id = game_id
+            # Bump first so results that embed the board already carry the new version
+            board.version += 1
+            result = mutation(board)
+            
+            new_data = board.to_dict()
+            changes = diff(data, new_data) if data else [((), new_data)]
+            if not [path for path, _ in changes if path != ("version",)]:
+                await pipe.unwatch()
+                return result, {"since": board.version - 1, "version": board.version - 1, "epoch": board.epoch, "patch": []}
+            
+            delta = {"since": board.version - 1, "version": board.version, "epoch": board.epoch,
+                     "patch": patch_from_diff(changes)}
+            pipe.multi()
+            for path, value in changes:
+                pipe.json().set(key, json_path(path), value)
+            if not data:
+                pipe.sadd(GAMES_KEY, game_id)
+                pipe.delete(journal_key(game_id))
+            pipe.rpush(journal_key(game_id), json.dumps({"version": delta["version"], "patch": delta["patch"]}))
+            pipe.ltrim(journal_key(game_id), -JOURNAL_LENGTH, -1)
+            pipe.publish(version_channel(game_id), board.version)
+            pipe.publish(game_channel(game_id), encode_json({"type": "game_state_patch", **delta}))
+            await pipe.execute()
+            board_cache.put(game_id, board, new_data)
+            manager.publish_delta(game_id, delta)
+            return result, delta
+        except redis.WatchError:
+            return _CONFLICT
 
-r = redis.Redis(host="ai.thewcl.com", port=6379, db=3, password="atmega328")
-REDIS_KEY = "monopoly:game_state"
 
 # ----------------------------
 # Data Model
@@ -271,12 +570,15 @@ class MonopolyBoard:
     pending_purchase: dict = field(default_factory=dict)  # For storing pending purchase decisions
     chance_deck: ChanceDeck = field(default_factory=ChanceDeck)
     chest_deck: ChestDeck = field(default_factory=ChestDeck)
+    version: int = 0  # bumped on every committed change, see commit_board()
+    epoch: str = ""  # random id given to each new game, see commit_board(); versions restart when a game is recreated
     
     def is_my_turn(self, player: str) -> bool:
         return self.state == "is_playing" and player == self.players[self.player_turn].name
     
     def check_game_over(self) -> bool:
         """Check if the game is over (only one player left non-bankrupt)."""
+        self._release_bankrupt_properties()
         active_players = [p for p in self.players if not p.bankrupt]
         if len(active_players) <= 1:
             self.state = "has_winner"
@@ -290,66 +592,153 @@ class MonopolyBoard:
             return active_players[0].name
         return "No winner yet"
     
+    def __post_init__(self):
+        # Engine hooks; the API layer swaps save_hook for save_board_to_redis
+        self.save_hook = no_persistence
+        self.log = print
+        self.rng = random
+        self.rent_collected = {}  # position -> total rent paid there, not persisted
+        self.game_id = DEFAULT_GAME_ID  # which stored game save_to_redis writes to
+        self._persisted = None  # last state written to / read from Redis
+        self._build_space_index()
+        self._build_ownership_index()
+
+    def _build_space_index(self):
+        """Build the position -> space lookup table used for O(1) space access."""
+        self._space_index = [None] * BOARD_SIZE
+        for spaces in (
+            self.regular_properties,
+            self.railroad_properties,
+            self.utility_properties,
+            self.chance_and_chest_spaces,
+            self.other_spaces,
+        ):
+            for space in spaces:
+                if 0 <= space.position < BOARD_SIZE:
+                    self._space_index[space.position] = space
+
+    def _build_ownership_index(self):
+        """
+        Build the per-owner property counts used for monopoly and rent checks.
+
+        _owned_counts maps owner name -> ownership group -> number of properties held,
+        where the group is a street color, "Railroads" or "Utilities".
+        """
+        self._color_groups = {}
+        for prop in self.regular_properties:
+            self._color_groups.setdefault(prop.color, []).append(prop)
+
+        self._owned_counts = {}
+        for props in (self.regular_properties, self.railroad_properties, self.utility_properties):
+            for prop in props:
+                if prop.owner is not None:
+                    self._adjust_owned_count(prop.owner, self._ownership_group(prop), 1)
+
+    @staticmethod
+    def _ownership_group(prop) -> str:
+        if isinstance(prop, RegularProperty):
+            return prop.color
+        if isinstance(prop, RailroadProperty):
+            return "Railroads"
+        return "Utilities"
+
+    def _adjust_owned_count(self, owner: str, group: str, delta: int):
+        counts = self._owned_counts.setdefault(owner, {})
+        counts[group] = counts.get(group, 0) + delta
+        if counts[group] == 0:
+            del counts[group]
+            if not counts:
+                del self._owned_counts[owner]
+
+    def owned_in_group(self, owner: str, group: str) -> int:
+        """Number of properties 'owner' holds in a color group, "Railroads" or "Utilities"."""
+        return self._owned_counts.get(owner, {}).get(group, 0)
+
+    def has_monopoly(self, owner: str, color: str) -> bool:
+        """Check whether 'owner' holds every street in a color group."""
+        group = self._color_groups.get(color)
+        return bool(group) and self.owned_in_group(owner, color) == len(group)
+
+    def _change_owner(self, prop, owner_name: str | None):
+        """Reassign a property and keep the ownership index in step."""
+        group = self._ownership_group(prop)
+        if prop.owner is not None:
+            self._adjust_owned_count(prop.owner, group, -1)
+        prop.owner = owner_name
+        if owner_name is not None:
+            self._adjust_owned_count(owner_name, group, 1)
+
+    def _release_bankrupt_properties(self):
+        """Return the properties of bankrupt players to the bank."""
+        for player in self.players:
+            if not player.bankrupt or player.name not in self._owned_counts:
+                continue
+            for props in (self.regular_properties, self.railroad_properties, self.utility_properties):
+                for prop in props:
+                    if prop.owner == player.name:
+                        self._change_owner(prop, None)
+                        if isinstance(prop, RegularProperty):
+                            prop.house_count = 0
+                        prop.mortgaged = False
+
+    def get_space(self, position: int):
+        """Return the live space object at a board position, or None."""
+        if 0 <= position < BOARD_SIZE:
+            return self._space_index[position]
+        return None
+
     def get_space_details(self, position: int) -> dict:
         """Get detailed information about a space based on its position."""
-        # Check regular properties
-        for prop in self.regular_properties:
-            if prop.position == position:
-                return {
-                    "type": "regular_property",
-                    "name": prop.name,
-                    "color": prop.color,
-                    "buy_price": prop.buy_price,
-                    "rent_price": prop.rent_price,
-                    "house_hotel_price": prop.house_hotel_price,
-                    "owner": prop.owner,
-                    "position": prop.position
-                }
-        
-        # Check railroad properties
-        for prop in self.railroad_properties:
-            if prop.position == position:
-                return {
-                    "type": "railroad_property",
-                    "name": prop.name,
-                    "buy_price": prop.buy_price,
-                    "rent_price": prop.rent_price,
-                    "owner": prop.owner,
-                    "position": prop.position
-                }
-        
-        # Check utility properties
-        for prop in self.utility_properties:
-            if prop.position == position:
-                return {
-                    "type": "utility_property",
-                    "name": prop.name,
-                    "buy_price": prop.buy_price,
-                    "rent_price": prop.rent_price,
-                    "owner": prop.owner,
-                    "position": prop.position
-                }
-        
-        # Check chance and community chest spaces
-        for space in self.chance_and_chest_spaces:
-            if space.position == position:
-                return {
-                    "type": "chance_chest_space",
-                    "name": space.name,
-                    "position": space.position,
-                    "chance": space.chance,
-                    "chest": space.chest
-                }
-        
-        # Check other special spaces
-        for space in self.other_spaces:
-            if space.position == position:
-                return {
-                    "type": "special_space",
-                    "name": space.name,
-                    "position": space.position
-                }
-        
+        space = self.get_space(position)
+
+        if isinstance(space, RegularProperty):
+            return {
+                "type": "regular_property",
+                "name": space.name,
+                "color": space.color,
+                "buy_price": space.buy_price,
+                "rent_price": space.rent_price,
+                "house_hotel_price": space.house_hotel_price,
+                "owner": space.owner,
+                "position": space.position
+            }
+
+        if isinstance(space, RailroadProperty):
+            return {
+                "type": "railroad_property",
+                "name": space.name,
+                "buy_price": space.buy_price,
+                "rent_price": space.rent_price,
+                "owner": space.owner,
+                "position": space.position
+            }
+
+        if isinstance(space, UtilityProperty):
+            return {
+                "type": "utility_property",
+                "name": space.name,
+                "buy_price": space.buy_price,
+                "rent_price": space.rent_price,
+                "owner": space.owner,
+                "position": space.position
+            }
+
+        if isinstance(space, ChestChanceSpace):
+            return {
+                "type": "chance_chest_space",
+                "name": space.name,
+                "position": space.position,
+                "chance": space.chance,
+                "chest": space.chest
+            }
+
+        if isinstance(space, SpecialSpace):
+            return {
+                "type": "special_space",
+                "name": space.name,
+                "position": space.position
+            }
+
         # If no space found, return generic position info
         return {
             "type": "unknown",
@@ -357,7 +746,7 @@ class MonopolyBoard:
             "position": position
         }
 
-    def make_move(self, player: str, index: int) -> dict:
+    def make_move(self, player: str, index: int, include_board: bool = True) -> dict:
         # Check for game over condition at the beginning of each turn
         if self.check_game_over():
             winner = self.get_winner()
@@ -371,7 +760,7 @@ class MonopolyBoard:
         
         current_player = self.players[self.player_turn]
         
-        die_set = DieSet(Die(), Die())
+        die_set = DieSet(Die(self.rng), Die(self.rng))
         die1, die2, total_roll, is_doubles = die_set.roll_and_check_doubles()
         
         # Handle jail mechanics
@@ -390,54 +779,18 @@ class MonopolyBoard:
                 # Build message with GO passing info
                 go_message = " Passed GO! Collected $200." if passed_go else ""
                 
-                # Check for bankruptcy and game over
-                if self.check_game_over():
-                    winner = self.get_winner()
-                    game_over_message = f" Game Over! {winner} wins!"
-                    self.save_to_redis()
-                    return {
-                        "success": True, 
-                        "message": f"{player} rolled ({die1}, {die2}). {jail_message}{go_message} {transaction_message}{game_over_message}", 
-                        "board": self.to_dict(),
-                        "space_details": space_details,
-                        "winner": winner
-                    }
-                
-                # Advance to next player's turn
-                self.player_turn = (self.player_turn + 1) % len(self.players)
-                
-                self.save_to_redis()
-                return {
-                    "success": True, 
-                    "message": f"{player} rolled ({die1}, {die2}). {jail_message}{go_message} {transaction_message}", 
-                    "board": self.to_dict(),
-                    "space_details": space_details
-                }
+                return self._finish_turn(
+                    f"{player} rolled ({die1}, {die2}). {jail_message}{go_message} {transaction_message}",
+                    space_details,
+                    include_board,
+                )
             else:
-                # Player is still in jail
-                # Check for bankruptcy and game over (player might have gone bankrupt paying jail fine)
-                if self.check_game_over():
-                    winner = self.get_winner()
-                    game_over_message = f" Game Over! {winner} wins!"
-                    self.save_to_redis()
-                    return {
-                        "success": True, 
-                        "message": f"{player} rolled ({die1}, {die2}). {jail_message}{game_over_message}", 
-                        "board": self.to_dict(),
-                        "space_details": self.get_space_details(10),  # Jail position
-                        "winner": winner
-                    }
-                
-                # Advance to next player's turn
-                self.player_turn = (self.player_turn + 1) % len(self.players)
-                
-                self.save_to_redis()
-                return {
-                    "success": True, 
-                    "message": f"{player} rolled ({die1}, {die2}). {jail_message}", 
-                    "board": self.to_dict(),
-                    "space_details": self.get_space_details(10)  # Jail position
-                }
+                # Player is still in jail (and might have gone bankrupt paying the jail fine)
+                return self._finish_turn(
+                    f"{player} rolled ({die1}, {die2}). {jail_message}",
+                    self.get_space_details(10),  # Jail position
+                    include_board,
+                )
         
         # Normal move (player not in jail)
         current_position, passed_go = current_player.move(total_roll)
@@ -464,13 +817,7 @@ class MonopolyBoard:
             if space_details["type"] == "utility_property" and space_details["owner"] is not None and space_details["owner"] != current_player.name:
                 # For utilities, use actual dice roll for rent calculation
                 rent_amount = self._calculate_utility_rent(space_details, total_roll)
-                current_player.pay(rent_amount)
-                
-                # Find the owner and pay them rent
-                for player_obj in self.players:
-                    if player_obj.name == space_details["owner"]:
-                        player_obj.receive(rent_amount)
-                        break
+                self._pay_rent(current_player, space_details, rent_amount)
                 
                 transaction_message = f"Paid ${rent_amount} rent to {space_details['owner']} for {space_details['name']} (dice roll: {total_roll})."
             else:
@@ -479,29 +826,38 @@ class MonopolyBoard:
         # Build message with GO passing info
         go_message = " Passed GO! Collected $200." if passed_go else ""
         
+        return self._finish_turn(
+            f"{player} rolled ({die1}, {die2}) = {total_roll} and moved to position {current_position}.{go_message} {transaction_message}",
+            space_details,
+            include_board,
+        )
+
+    def _finish_turn(self, message: str, space_details: dict, include_board: bool = True) -> dict:
+        """End the current turn: check for a winner or pass the turn on, persist, and build the move result."""
+        winner = None
         # Check for bankruptcy and game over
         if self.check_game_over():
             winner = self.get_winner()
-            game_over_message = f" Game Over! {winner} wins!"
-            self.save_to_redis()
-            return {
-                "success": True, 
-                "message": f"{player} rolled ({die1}, {die2}) = {total_roll} and moved to position {current_position}.{go_message} {transaction_message}{game_over_message}", 
-                "board": self.to_dict(),
-                "space_details": space_details,
-                "winner": winner
-            }
-        
-        # Advance to next player's turn
-        self.player_turn = (self.player_turn + 1) % len(self.players)
-        
-        self.save_to_redis()
-        return {
-            "success": True, 
-            "message": f"{player} rolled ({die1}, {die2}) = {total_roll} and moved to position {current_position}.{go_message} {transaction_message}", 
-            "board": self.to_dict(),
-            "space_details": space_details
-        }
+            message += f" Game Over! {winner} wins!"
+        else:
+            self._advance_turn()
+        
+        self.save()
+        result = {"success": True, "message": message}
+        if include_board:
+            result["board"] = self.to_dict()
+        result["space_details"] = space_details
+        if winner is not None:
+            result["winner"] = winner
+        return result
+
+    def _advance_turn(self):
+        """Pass the turn to the next player who is still in the game."""
+        for _ in range(len(self.players)):
+            self.player_turn = (self.player_turn + 1) % len(self.players)
+            if not self.players[self.player_turn].bankrupt:
+                break
+
     def _handle_property_transaction(self, current_player: Player, space_details: dict) -> str:
         """Handle property buying or rent payment when a player lands on a property."""
         property_name = space_details["name"]
@@ -522,13 +878,7 @@ class MonopolyBoard:
         # If property is owned by another player, pay rent
         elif owner != current_player.name:
             rent_amount = self._calculate_rent(space_details)
-            current_player.pay(rent_amount)
-            
-            # Find the owner and pay them rent
-            for player in self.players:
-                if player.name == owner:
-                    player.receive(rent_amount)
-                    break
+            self._pay_rent(current_player, space_details, rent_amount)
             
             return f"Paid ${rent_amount} rent to {owner} for {property_name}."
         
@@ -536,6 +886,19 @@ class MonopolyBoard:
         else:
             return f"Landed on own property: {property_name}."
     
+    def _pay_rent(self, current_player: Player, space_details: dict, rent_amount: int):
+        """Move rent from the current player to the property's owner and record it."""
+        current_player.pay(rent_amount)
+        
+        # Find the owner and pay them rent
+        for player in self.players:
+            if player.name == space_details["owner"]:
+                player.receive(rent_amount)
+                break
+        
+        position = space_details["position"]
+        self.rent_collected[position] = self.rent_collected.get(position, 0) + rent_amount
+    
     def handle_property_purchase(self, player_name: str, property_position: int, decision: str) -> dict:
         """Handle a property purchase decision made by a player."""
         # Find the player
@@ -559,13 +922,13 @@ class MonopolyBoard:
             if player.money >= buy_price:
                 player.pay(buy_price)
                 self._set_property_owner(space_details, player_name)
-                self.save_to_redis()
-                print(f"{player_name} bought {space_details['name']} for ${buy_price}")
+                self.save()
+                self.log(f"{player_name} bought {space_details['name']} for ${buy_price}")
                 return {"success": True, "message": f"Bought {space_details['name']} for ${buy_price}"}
             else:
                 return {"success": False, "message": "Insufficient funds"}
         else:
-            print(f"{player_name} chose not to buy {space_details['name']}")
+            self.log(f"{player_name} chose not to buy {space_details['name']}")
             return {"success": True, "message": f"Chose not to buy {space_details['name']}"}
     
     def _simulate_property_purchase_choice(self, player_name: str, property_name: str, buy_price: int) -> str:
@@ -585,24 +948,10 @@ class MonopolyBoard:
         return "pending"
     
     def _set_property_owner(self, space_details: dict, owner_name: str):
-        """Set the owner of a property based on its type and position."""
-        position = space_details["position"]
-        
-        if space_details["type"] == "regular_property":
-            for prop in self.regular_properties:
-                if prop.position == position:
-                    prop.owner = owner_name
-                    break
-        elif space_details["type"] == "railroad_property":
-            for prop in self.railroad_properties:
-                if prop.position == position:
-                    prop.owner = owner_name
-                    break
-        elif space_details["type"] == "utility_property":
-            for prop in self.utility_properties:
-                if prop.position == position:
-                    prop.owner = owner_name
-                    break
+        """Set the owner of a property based on its position."""
+        prop = self.get_space(space_details["position"])
+        if isinstance(prop, (RegularProperty, RailroadProperty, UtilityProperty)):
+            self._change_owner(prop, owner_name)
     
     def _calculate_rent(self, space_details: dict) -> int:
         """Calculate rent for a property based on its type and ownership."""
@@ -612,19 +961,11 @@ class MonopolyBoard:
             owner = space_details["owner"]
             color = space_details["color"]
             
-            # Check if owner has monopoly (owns all properties in this color group)
-            properties_in_color = [prop for prop in self.regular_properties if prop.color == color]
-            owned_properties_in_color = [prop for prop in properties_in_color if prop.owner == owner]
-            
             # Get house count for this specific property
-            house_count = 0
-            for prop in self.regular_properties:
-                if prop.position == space_details["position"]:
-                    house_count = prop.house_count
-                    break
+            house_count = self.get_space(space_details["position"]).house_count
             
             # If owner has monopoly, calculate rent based on house count
-            if len(owned_properties_in_color) == len(properties_in_color):
+            if self.has_monopoly(owner, color):
                 if house_count == 0:
                     return rent_prices[1]  # Set rent for monopoly with no houses (index 1)
                 elif house_count <= 4:
@@ -637,7 +978,7 @@ class MonopolyBoard:
         elif space_details["type"] == "railroad_property":
             # For railroads, rent depends on how many railroads the owner has
             owner = space_details["owner"]
-            railroads_owned = sum(1 for prop in self.railroad_properties if prop.owner == owner)
+            railroads_owned = self.owned_in_group(owner, "Railroads")
             rent_prices = space_details["rent_price"]
             # Rent index: 0 for 1 railroad, 1 for 2 railroads, etc.
             return rent_prices[min(railroads_owned - 1, len(rent_prices) - 1)]
@@ -645,7 +986,7 @@ class MonopolyBoard:
         elif space_details["type"] == "utility_property":
             # For utilities, rent is based on dice roll multiplier
             owner = space_details["owner"]
-            utilities_owned = sum(1 for prop in self.utility_properties if prop.owner == owner)
+            utilities_owned = self.owned_in_group(owner, "Utilities")
             rent_multiplier = space_details["rent_price"]
             
             # If owner has 1 utility, multiply dice roll by 4; if 2 utilities, multiply by 10
@@ -661,20 +1002,11 @@ class MonopolyBoard:
         """Get all monopoly sets owned by a player."""
         monopoly_sets = []
         
-        # Group properties by color
-        color_groups = {}
-        for prop in self.regular_properties:
-            if prop.color not in color_groups:
-                color_groups[prop.color] = []
-            color_groups[prop.color].append(prop)
-        
-        # Check each color group for monopoly
-        for color, properties in color_groups.items():
-            owned_properties = [prop for prop in properties if prop.owner == player_name]
-            if len(owned_properties) == len(properties):  # Player owns all properties in this color
+        for color, properties in self._color_groups.items():
+            if self.has_monopoly(player_name, color):  # Player owns all properties in this color
                 monopoly_sets.append({
                     "color": color,
-                    "properties": owned_properties
+                    "properties": list(properties)
                 })
         
         return monopoly_sets
@@ -682,27 +1014,16 @@ class MonopolyBoard:
     def can_buy_houses(self, player_name: str, property_position: int) -> tuple[bool, str]:
         """Check if a player can buy a house on a specific property."""
         # Find the property
-        target_property = None
-        for prop in self.regular_properties:
-            if prop.position == property_position:
-                target_property = prop
-                break
+        target_property = self.get_space(property_position)
         
-        if not target_property:
+        if not isinstance(target_property, RegularProperty):
             return False, "Property not found"
         
         if target_property.owner != player_name:
             return False, "You don't own this property"
         
         # Check if player has monopoly
-        monopoly_sets = self.get_monopoly_sets(player_name)
-        player_monopoly = None
-        for monopoly_set in monopoly_sets:
-            if target_property in monopoly_set["properties"]:
-                player_monopoly = monopoly_set
-                break
-        
-        if not player_monopoly:
+        if not self.has_monopoly(player_name, target_property.color):
             return False, "You must own all properties in the color group to buy houses"
         
         # Check if property already has a hotel
@@ -710,7 +1031,7 @@ class MonopolyBoard:
             return False, "Property already has a hotel"
         
         # Check even building rule (can't have more than 1 house difference)
-        min_houses = min(prop.house_count for prop in player_monopoly["properties"])
+        min_houses = min(prop.house_count for prop in self._color_groups[target_property.color])
         if target_property.house_count > min_houses:
             return False, "Must build evenly across the monopoly set"
         
@@ -730,11 +1051,7 @@ class MonopolyBoard:
             return {"success": False, "message": message}
         
         # Find the property and player
-        target_property = None
-        for prop in self.regular_properties:
-            if prop.position == property_position:
-                target_property = prop
-                break
+        target_property = self.get_space(property_position)
         
         player = next(p for p in self.players if p.name == player_name)
         
@@ -743,8 +1060,8 @@ class MonopolyBoard:
         player.pay(house_cost)
         target_property.house_count += 1
         
-        # Save to Redis
-        self.save_to_redis()
+        # Persist the change (Redis when served over the API)
+        self.save()
         
         if target_property.house_count == 5:
             return {"success": True, "message": f"Bought hotel on {target_property.name} for ${house_cost}"}
@@ -772,6 +1089,81 @@ class MonopolyBoard:
         
         return options
     
+    def play_turn(self, player_name: str, build_before=(), jail_action: Optional[str] = None,
+                  max_price: Optional[int] = None, cash_reserve: int = 0, build_after=(), buy=()) -> dict:
+        """
+        Play a whole turn from a plan: house builds, an optional jail action, the roll,
+        a purchase decision for the landing space and more builds.
+
+        Args:
+            build_before / build_after: Positions to build a house on before and after
+                the roll, in order; "cheapest" builds on the cheapest available option.
+                Builds that are not allowed are skipped.
+            jail_action: 'use_card' or 'pay_fine' to try before rolling while in jail.
+            max_price: Buy an unowned landing space costing at most this; None never buys.
+            cash_reserve: Money to keep after any purchase or build.
+            buy: Positions to buy if the roll lands on them, whatever max_price says.
+
+        Returns:
+            dict: The move's success, message and space_details, plus the messages of
+            the builds, jail action and purchase that happened and the player's
+            resulting money and position.
+        """
+        if self.state != "is_playing":
+            return {"success": False, "message": "Game is over. Please reset."}
+        if not self.is_my_turn(player_name):
+            return {"success": False, "message": f"It is not {player_name}'s turn."}
+        
+        player = self.players[self.player_turn]
+        actions = self._build_houses(player, build_before, cash_reserve)
+        
+        if player.in_jail and jail_action == "use_card" and player.use_get_out_of_jail_free_card():
+            actions.append(f"{player_name} used a Get Out of Jail Free card!")
+        elif player.in_jail and jail_action == "pay_fine" and player.money - 50 >= cash_reserve and player.pay_jail_fine():
+            actions.append(f"{player_name} paid $50 fine and got out of jail!")
+        
+        result = self.make_move(player_name, 0, include_board=False)
+        if not result["success"]:
+            return {**result, "actions": actions}
+        
+        space_details = result["space_details"]
+        # Only properties have a buy_price; GO, taxes, cards and corners are never bought
+        if (space_details["type"] in ("regular_property", "railroad_property", "utility_property") and
+                space_details["owner"] is None and
+                not player.bankrupt and
+                (space_details["position"] in buy or
+                 (max_price is not None and space_details["buy_price"] <= max_price)) and
+                space_details["buy_price"] > 0 and
+                player.money - space_details["buy_price"] >= cash_reserve):
+            actions.append(self.handle_property_purchase(player_name, space_details["position"], "y")["message"])
+        
+        if not player.bankrupt:
+            actions.extend(self._build_houses(player, build_after, cash_reserve))
+        
+        return {
+            **result,
+            "actions": actions,
+            "money": player.money,
+            "position": player.position,
+        }
+    
+    def _build_houses(self, player: Player, steps, cash_reserve: int) -> list[str]:
+        """Buy the houses listed in a turn plan, returning a message per house bought."""
+        messages = []
+        for step in steps:
+            if step == "cheapest":
+                options = self.get_house_buying_options(player.name)
+                if not options:
+                    continue
+                step = min(options, key=lambda option: option["house_cost"])["position"]
+            prop = self.get_space(step)
+            if not isinstance(prop, RegularProperty) or player.money - prop.house_hotel_price < cash_reserve:
+                continue
+            result = self.buy_house(player.name, step)
+            if result["success"]:
+                messages.append(result["message"])
+        return messages
+    
     def _handle_special_space(self, current_player: Player, space_details: dict, dice_roll: int) -> str:
         """Handle landing on special spaces like Go, Jail, Free Parking, Go To Jail, and taxes."""
         space_name = space_details["name"]
@@ -848,7 +1240,7 @@ class MonopolyBoard:
     def _calculate_utility_rent(self, space_details: dict, dice_roll: int) -> int:
         """Calculate rent for utilities based on actual dice roll."""
         owner = space_details["owner"]
-        utilities_owned = sum(1 for prop in self.utility_properties if prop.owner == owner)
+        utilities_owned = self.owned_in_group(owner, "Utilities")
         
         # If owner has 1 utility, multiply dice roll by 4; if 2 utilities, multiply by 10
         multiplier = 4 if utilities_owned == 1 else 10
@@ -884,7 +1276,7 @@ class MonopolyBoard:
         # Add more chance card actions as needed
         else:
             # For actions not implemented yet, just log it
-            print(f"Chance action '{action}' not implemented yet")
+            self.log(f"Chance action '{action}' not implemented yet")
     
     def _execute_chest_action(self, action: str, player: Player):
         """Execute a community chest card action based on the action string."""
@@ -933,7 +1325,7 @@ class MonopolyBoard:
         # Add more chest card actions as needed
         else:
             # For actions not implemented yet, just log it
-            print(f"Chest action '{action}' not implemented yet")
+            self.log(f"Chest action '{action}' not implemented yet")
     
     def reset(self, new_players: list[str]):
         self.state = "is_playing"
@@ -1006,21 +1398,51 @@ class MonopolyBoard:
                 )
                 self.other_spaces.append(prop)
         
+        self._build_space_index()
+        self._build_ownership_index()
+        
         # Shuffle the chance and chest decks to randomize card order
-        self.chance_deck.shuffle_deck()
-        self.chest_deck.shuffle_deck()
+        self.chance_deck.shuffle_deck(self.rng)
+        self.chest_deck.shuffle_deck(self.rng)
         
-        self.save_to_redis()
+        self.save()
+
+    def save(self):
+        """Persist the board through its save hook (a no-op for in-memory games)."""
+        self.save_hook(self)
 
     def save_to_redis(self):
-        r.json().set(REDIS_KEY, Path.root_path(), self.to_dict())
+        """
+        Write the board to Redis. Only the paths that changed since the last load or
+        save are sent, pipelined into one round trip; a board Redis has not seen yet
+        is written whole.
+        """
+        data = self.to_dict()
+        if self._persisted is None:
+            changes = [(Path.root_path(), data)]
+        else:
+            changes = diff_paths(self._persisted, data)
+        
+        if changes:
+            pipe = get_redis().json().pipeline(transaction=False)
+            for path, value in changes:
+                pipe.set(state_key(self.game_id), path, value)
+            pipe.execute()
+        self._persisted = data
 
     @classmethod
-    def load_from_redis(cls):
-        data = r.json().get(REDIS_KEY)
-        if not data:
-            return cls(players=[])
-        
+    def load_from_redis(cls, game_id: str = DEFAULT_GAME_ID):
+        data = get_redis().json().get(state_key(game_id))
+        board = cls.from_dict(data) if data else cls(players=[])
+        board.game_id = game_id
+        board.save_hook = save_board_to_redis
+        # Remember what Redis holds so save_to_redis can send just the changes
+        board._persisted = data or None
+        return board
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "MonopolyBoard":
+        """Rebuild a board from its to_dict() form."""
         # Convert player dictionaries back to Player objects
         players = [Player(**player_data) for player_data in data.get('players', [])]
         
@@ -1046,15 +1468,56 @@ class MonopolyBoard:
             player_turn=data.get('player_turn', 0),
             pending_purchase=data.get('pending_purchase', {}),
             chance_deck=chance_deck,
-            chest_deck=chest_deck
+            chest_deck=chest_deck,
+            version=data.get('version', 0),
+            epoch=data.get('epoch', ''),
         )
 
     def to_dict(self):
-        result = asdict(self)
-        # Serialize deck states
-        result['chance_deck'] = self.chance_deck.to_dict()
-        result['chest_deck'] = self.chest_deck.to_dict()
-        return result
+        # Hand-built rather than dataclasses.asdict, which deep-copies every field recursively
+        return {
+            'players': [player.to_dict() for player in self.players],
+            'regular_properties': [prop.to_dict() for prop in self.regular_properties],
+            'railroad_properties': [prop.to_dict() for prop in self.railroad_properties],
+            'utility_properties': [prop.to_dict() for prop in self.utility_properties],
+            'chance_and_chest_spaces': [space.to_dict() for space in self.chance_and_chest_spaces],
+            'other_spaces': [space.to_dict() for space in self.other_spaces],
+            'state': self.state,
+            'player_turn': self.player_turn,
+            'pending_purchase': dict(self.pending_purchase),
+            # Serialize deck states
+            'chance_deck': self.chance_deck.to_dict(),
+            'chest_deck': self.chest_deck.to_dict(),
+            'version': self.version,
+            'epoch': self.epoch,
+        }
+
+    def clone(self) -> "MonopolyBoard":
+        """
+        Copy the board's mutable state. Static data (names, prices, rent tables, cards)
+        is shared with the original; engine hooks carry over.
+        """
+        board = MonopolyBoard(
+            players=[player.copy() for player in self.players],
+            regular_properties=[prop.copy() for prop in self.regular_properties],
+            railroad_properties=[prop.copy() for prop in self.railroad_properties],
+            utility_properties=[prop.copy() for prop in self.utility_properties],
+            # Chance/Chest and special spaces never change during a game
+            chance_and_chest_spaces=self.chance_and_chest_spaces,
+            other_spaces=self.other_spaces,
+            state=self.state,
+            player_turn=self.player_turn,
+            pending_purchase=dict(self.pending_purchase),
+            chance_deck=ChanceDeck(cards=list(self.chance_deck.cards)),
+            chest_deck=ChestDeck(cards=list(self.chest_deck.cards)),
+            version=self.version,
+            epoch=self.epoch,
+        )
+        board.save_hook = self.save_hook
+        board.game_id = self.game_id
+        board.log = self.log
+        board.rng = self.rng
+        return board
 
     def serialize(self):
         return json.dumps(self.to_dict())
@@ -1064,30 +1527,213 @@ class MonopolyBoard:
 # FastAPI App
 # ----------------------------
 
-app = FastAPI()
+# to_dict() keys of properties that change during a game; the rest is in the board layout
+DYNAMIC_PROPERTY_KEYS = ("position", "house_count", "owner", "mortgaged")
+
+
+def _dynamic_properties(properties: list[dict]) -> list[dict]:
+    return [{key: prop[key] for key in DYNAMIC_PROPERTY_KEYS if key in prop} for prop in properties]
+
+
+def dynamic_view(state: dict) -> dict:
+    """
+    The mutable part of a to_dict() snapshot, in the same shape so JSON Patches from
+    the journal still apply. Names, prices, rents, the fixed spaces and card texts
+    are left out; clients get them once from /board_layout.
+    """
+    return {
+        'players': state['players'],
+        'regular_properties': _dynamic_properties(state['regular_properties']),
+        'railroad_properties': _dynamic_properties(state['railroad_properties']),
+        'utility_properties': _dynamic_properties(state['utility_properties']),
+        'state': state['state'],
+        'player_turn': state['player_turn'],
+        'pending_purchase': state['pending_purchase'],
+        'chance_deck': {'cards': [{'name': card['name']} for card in state['chance_deck']['cards']]},
+        'chest_deck': {'cards': [{'name': card['name']} for card in state['chest_deck']['cards']]},
+        'version': state['version'],
+        'epoch': state.get('epoch', ''),
+    }
+
+
+STATE_VIEWS = {
+    "full": encode_json,
+    "dynamic": lambda state: encode_json(dynamic_view(state)),
+}
+
+
+@functools.cache
+def board_layout() -> tuple[bytes, str]:
+    """
+    The static board every game shares, as (JSON bytes, ETag): each space's fixed
+    fields by position and the text of every card by card name.
+    """
+    board = MonopolyBoard(players=[])
+    board.reset([])
+    spaces = []
+    for position in range(BOARD_SIZE):
+        space = board.get_space(position).to_dict()
+        spaces.append({
+            "type": board.get_space_details(position)["type"],
+            **{key: value for key, value in space.items() if key not in DYNAMIC_PROPERTY_KEYS or key == "position"},
+        })
+    layout = {
+        "spaces": spaces,
+        "chance_cards": {card.name: {"description": card.description, "action": card.action} for card in board.chance_deck.cards},
+        "chest_cards": {card.name: {"description": card.description, "action": card.action} for card in board.chest_deck.cards},
+    }
+    body = encode_json(layout)
+    return body, f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+
+
+# Running manager.refresh tasks; the event loop only keeps weak references to tasks
+_refresh_tasks: set[asyncio.Task] = set()
+
+
+def _on_refresh_done(task: asyncio.Task):
+    _refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        print(f"Failed to refresh WebSocket clients: {task.exception()}")
+
+
+def _on_version_message(message):
+    # Channel is monopoly:game:{game_id}:version; version 0 means the game was deleted
+    game_id = message["channel"].decode().split(":")[2]
+    version = int(message["data"])
+    board_cache.invalidate(game_id, version if version else None)
+    if not version:
+        manager.forget(game_id)
+    elif version > manager.last_version.get(game_id, 0) and game_id in manager.active_connections:
+        task = asyncio.create_task(manager.refresh(game_id))
+        _refresh_tasks.add(task)
+        task.add_done_callback(_on_refresh_done)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    global _async_redis
+    # A client injected before startup (e.g. in tests) is used as is and left open
+    owns_client = _async_redis is None
+    if owns_client:
+        pool = aioredis.BlockingConnectionPool(max_connections=REDIS_POOL_SIZE, timeout=REDIS_POOL_TIMEOUT, **REDIS_SETTINGS)
+        _async_redis = aioredis.Redis(connection_pool=pool)
+    
+    # Drop cached boards as soon as another server process commits a newer version.
+    # Correctness does not depend on this: every lookup still checks the stored epoch and version.
+    pubsub = _async_redis.pubsub(ignore_subscribe_messages=True)
+    listener = None
+    try:
+        await pubsub.psubscribe(**{version_channel("*"): _on_version_message})
+        listener = asyncio.create_task(pubsub.run())
+    except redis.RedisError as e:
+        print(f"Board cache invalidation disabled: {e}")
+    
+    yield
+    
+    if listener is not None:
+        listener.cancel()
+    await pubsub.aclose()
+    if owns_client:
+        await _async_redis.aclose(close_connection_pool=True)
+        _async_redis = None
+
+
+app = FastAPI(lifespan=lifespan, default_response_class=FastJSONResponse)
 
 # WebSocket connection manager
 class ConnectionManager:
+    """
+    Fans game updates out to the WebSocket clients watching each game.
+
+    Each commit is broadcast once as a game_state_patch message holding its JSON
+    Patch; a connection gets a full game_state_update when it connects or asks for
+    one. An update is serialized once and queued for every connection; each
+    connection has its own sender task draining a bounded queue, so a slow client
+    only delays itself. A client whose queue overflows has it emptied and is sent a
+    fresh snapshot instead.
+    """
+    SEND_QUEUE_SIZE = 16
+    RESYNC = object()  # queued in place of dropped patches
+
     def __init__(self):
-        self.active_connections: list[WebSocket] = []
+        self.active_connections: dict[str, dict[WebSocket, asyncio.Queue]] = {}
+        # Last version broadcast per game (and its epoch), so local commits and their
+        # echo from version_channel are only sent once
+        self.last_version: dict[str, int] = {}
+        self.last_epoch: dict[str, str] = {}
 
-    async def connect(self, websocket: WebSocket):
+    async def connect(self, game_id: str, websocket: WebSocket) -> asyncio.Queue:
         await websocket.accept()
-        self.active_connections.append(websocket)
+        queue = asyncio.Queue(maxsize=self.SEND_QUEUE_SIZE)
+        self.active_connections.setdefault(game_id, {})[websocket] = queue
+        queue.put_nowait(self.RESYNC)
+        return queue
 
-    def disconnect(self, websocket: WebSocket):
-        self.active_connections.remove(websocket)
+    def disconnect(self, game_id: str, websocket: WebSocket):
+        connections = self.active_connections.get(game_id, {})
+        connections.pop(websocket, None)
+        if not connections:
+            self.active_connections.pop(game_id, None)
+            self.last_version.pop(game_id, None)
+            self.last_epoch.pop(game_id, None)
 
-    async def send_personal_message(self, message: str, websocket: WebSocket):
-        await websocket.send_text(message)
+    def enqueue(self, queue: asyncio.Queue, message):
+        if queue.full():
+            while not queue.empty():
+                queue.get_nowait()
+            message = self.RESYNC
+        queue.put_nowait(message)
 
-    async def broadcast(self, message: str):
-        for connection in self.active_connections:
-            try:
-                await connection.send_text(message)
-            except:
-                # Remove broken connections
-                self.active_connections.remove(connection)
+    async def sender(self, game_id: str, websocket: WebSocket, queue: asyncio.Queue):
+        try:
+            while True:
+                message = await queue.get()
+                if message is self.RESYNC:
+                    entry = await cached_board(game_id)
+                    if entry is None:
+                        continue
+                    data = entry.encode("dynamic", STATE_VIEWS["dynamic"])
+                    message = (b'{"type":"game_state_update","data":' + data + b'}').decode()
+                await websocket.send_text(message)
+        except Exception:
+            # Broken connection; the receive loop sees the disconnect and cleans up
+            pass
+
+    def broadcast(self, game_id: str, message: str):
+        for queue in self.active_connections.get(game_id, {}).values():
+            self.enqueue(queue, message)
+
+    def publish_delta(self, game_id: str, delta: dict):
+        """Broadcast a commit's patch unless that version (of the same epoch) was already sent."""
+        if game_id not in self.active_connections:
+            return
+        if delta["epoch"] == self.last_epoch.get(game_id) and delta["version"] <= self.last_version.get(game_id, 0):
+            return
+        self.last_version[game_id] = delta["version"]
+        self.last_epoch[game_id] = delta["epoch"]
+        self.broadcast(game_id, encode_json({"type": "game_state_patch", **delta}).decode())
+
+    async def refresh(self, game_id: str):
+        """Broadcast the changes another server process committed to a game."""
+        last_version = self.last_version.get(game_id)
+        last_epoch = self.last_epoch.get(game_id)
+        delta = await journal_since(game_id, last_version, last_epoch) if last_version else None
+        if delta is not None:
+            self.publish_delta(game_id, delta)
+            return
+        entry = await cached_board(game_id)
+        if entry is not None and (entry.board.epoch != last_epoch or entry.version > self.last_version.get(game_id, 0)):
+            self.last_version[game_id] = entry.version
+            self.last_epoch[game_id] = entry.board.epoch
+            data = entry.encode("dynamic", STATE_VIEWS["dynamic"])
+            self.broadcast(game_id, (b'{"type":"game_state_update","data":' + data + b'}').decode())
+
+    def forget(self, game_id: str):
+        # A deleted game may be recreated, restarting its versions at 1; clients
+        # empty their mirrors so they do not take its patches for old ones
+        self.last_version.pop(game_id, None)
+        self.last_epoch.pop(game_id, None)
+        self.broadcast(game_id, encode_json(GAME_DELETED_MESSAGE).decode())
 
 manager = ConnectionManager()
 
@@ -1097,20 +1743,163 @@ class MoveRequest(BaseModel):
     index: int
 
 
-@app.get("/state")
-def get_state():
-    board = MonopolyBoard.load_from_redis()
-    return board.to_dict()
+GAME_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+async def validate_game_id(game_id: str):
+    if not GAME_ID_PATTERN.match(game_id):
+        raise HTTPException(status_code=400, detail="Game id must be 1-64 letters, digits, '-' or '_'")
+
+
+# Every per-game endpoint lives under /games/{game_id}
+game_router = APIRouter(prefix="/games/{game_id}", dependencies=[Depends(validate_game_id)])
+
+
+async def commit(game_id: str, mutation, create: bool = False, with_patch: bool = False):
+    """Run commit_board for a request handler, mapping failures to HTTP errors."""
+    try:
+        return await commit_board(game_id, mutation, create=create, with_patch=with_patch)
+    except GameNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ConcurrentUpdateError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 
+async def load_game(game_id: str, stamp: Optional[tuple[str, int]] = None):
+    """
+    Return the cached board and snapshot of a game for a read-only handler, or 404 if
+    it does not exist. Both are shared with other requests and must not be mutated.
+    """
+    entry = await cached_board(game_id, stamp)
+    if entry is None:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+    return entry
 
-@app.post("/move")
-def post_move(req: MoveRequest):
-    board = MonopolyBoard.load_from_redis()
+
+def etag_for(epoch: str, version: int) -> str:
+    """
+    ETag shared by everything the read endpoints return for a game at 'version'.
+    The epoch keeps a recreated game's tags from matching the deleted game's.
+    """
+    return f'"{epoch}-v{version}"'
+
+
+async def conditional_version(game_id: str, request: Request, response: Response) -> tuple[str, int]:
+    """
+    Read a game's stored (epoch, version) for a read endpoint and tag the response with it.
+    Answers 304 Not Modified straight away, without loading the board, when the
+    client's If-None-Match already names this version; 404 if the game does not exist.
+    """
+    stamp = await stored_stamp(get_async_redis(), game_id)
+    if stamp is None:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+    epoch, version = stamp
+    etag = etag_for(epoch, version)
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request, etag):
+        raise HTTPException(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return stamp
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Whether the request's If-None-Match names 'etag'."""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and etag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(","))
+
+
+def player_names_for(num_players: int) -> list[str]:
+    # Validate number of players
+    if not (2 <= num_players <= 6):
+        raise HTTPException(status_code=400, detail="Number of players must be between 2 and 6")
+    return [f"Player {i+1}" for i in range(num_players)]
+
+
+class CreateGameRequest(BaseModel):
+    num_players: int
+    game_id: Optional[str] = None
+
+
+@app.post("/games")
+async def post_create_game(req: CreateGameRequest):
+    game_id = req.game_id or uuid.uuid4().hex[:12]
+    await validate_game_id(game_id)
+    player_names = player_names_for(req.num_players)
+    
+    def create_game(board: MonopolyBoard):
+        if board.players:
+            raise HTTPException(status_code=409, detail=f"Game {game_id} already exists")
+        board.reset(player_names)
+    
+    await commit(game_id, create_game, create=True)
+    return {"success": True, "game_id": game_id, "players": player_names}
+
+
+@app.get("/games")
+async def get_games():
+    members = await get_async_redis().smembers(GAMES_KEY)
+    return {"games": sorted(member.decode() for member in members)}
+
+
+@app.delete("/games/{game_id}", dependencies=[Depends(validate_game_id)])
+async def delete_game(game_id: str):
+    async with get_async_redis().pipeline() as pipe:
+        pipe.delete(state_key(game_id))
+        pipe.delete(journal_key(game_id))
+        pipe.srem(GAMES_KEY, game_id)
+        pipe.publish(version_channel(game_id), 0)
+        pipe.publish(game_channel(game_id), encode_json(GAME_DELETED_MESSAGE))
+        deleted, *_ = await pipe.execute()
+    board_cache.invalidate(game_id)
+    manager.forget(game_id)
+    if not deleted:
+        raise HTTPException(status_code=404, detail=f"Game {game_id} not found")
+    return {"success": True, "message": f"Game {game_id} deleted"}
+
+
+@game_router.get("/state")
+async def get_state(game_id: str, request: Request, response: Response, since: Optional[int] = None,
+                    epoch: Optional[str] = None, view: Literal["full", "dynamic"] = "full"):
+    """
+    The game's full state, or with ?since=<version>&epoch=<epoch> a delta from that
+    version: {"since", "version", "epoch", "patch"} with an RFC 6902 patch, or
+    {"version", "state"} when the journal no longer reaches back that far or the
+    game has been recreated since (its epoch differs). Supports If-None-Match.
+
+    view=dynamic leaves the static board (see /board_layout) out of full states.
+    Encoded states are cached per version, so repeat requests skip serialization.
+    """
+    stamp = await conditional_version(game_id, request, response)
+    headers = dict(response.headers)
+    if since is not None:
+        delta = await journal_since(game_id, since, epoch, stamp)
+        if delta is not None:
+            return FastJSONResponse(delta, headers=headers)
+    entry = await load_game(game_id, stamp)
+    body = entry.encode(view, STATE_VIEWS[view])
+    if since is not None:
+        body = b'{"version":%d,"state":%s}' % (entry.version, body)
+    return FastJSONResponse(body, headers=headers)
+
+
+@app.get("/board_layout")
+async def get_board_layout(request: Request):
+    """The static board shared by every game; it never changes while the server runs."""
+    body, etag = board_layout()
+    headers = {"ETag": etag, "Cache-Control": "public, max-age=31536000, immutable"}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return FastJSONResponse(body, headers=headers)
+
+
+@game_router.post("/move")
+async def post_move(game_id: str, req: MoveRequest):
     # ipdb.set_trace()
-    result = board.make_move(req.player, req.index)
+    # The response carries this move's patch rather than the whole board
+    result, delta = await commit(game_id, lambda board: board.make_move(req.player, req.index, include_board=False), with_patch=True)
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
-    return result
+    return FastJSONResponse({**result, **delta})
 
 
 
@@ -1121,106 +1910,154 @@ class PurchaseDecisionRequest(BaseModel):
     decision: str  # 'y' or 'n'
 
 
-@app.post("/purchase")
-def post_purchase_decision(req: PurchaseDecisionRequest):
-    board = MonopolyBoard.load_from_redis()
-    result = board.handle_property_purchase(req.player, req.position, req.decision)
+@game_router.post("/purchase")
+async def post_purchase_decision(game_id: str, req: PurchaseDecisionRequest):
+    result, delta = await commit(game_id, lambda board: board.handle_property_purchase(req.player, req.position, req.decision), with_patch=True)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
     
-    return result
+    return FastJSONResponse({**result, **delta})
 
 
 class JailActionRequest(BaseModel):
     player: str
     action: str  # 'use_card' or 'pay_fine'
 
-@app.post("/jail_action")
-def post_jail_action(req: JailActionRequest):
-    board = MonopolyBoard.load_from_redis()
-    
-    # Find the player
-    player = None
-    for p in board.players:
-        if p.name == req.player:
-            player = p
-            break
-    
-    if not player:
-        raise HTTPException(status_code=400, detail="Player not found")
-    
-    if not player.in_jail:
-        raise HTTPException(status_code=400, detail="Player is not in jail")
-    
-    if req.action == "use_card":
-        success = player.use_get_out_of_jail_free_card()
-        if success:
-            board.save_to_redis()
-            return {"success": True, "message": f"{req.player} used a Get Out of Jail Free card!"}
-        else:
-            return {"success": False, "message": "No Get Out of Jail Free cards available"}
-    
-    elif req.action == "pay_fine":
-        success = player.pay_jail_fine()
-        if success:
-            board.save_to_redis()
-            return {"success": True, "message": f"{req.player} paid $50 fine and got out of jail!"}
+@game_router.post("/jail_action")
+async def post_jail_action(game_id: str, req: JailActionRequest):
+    def apply_jail_action(board: MonopolyBoard) -> dict:
+        # Find the player
+        player = None
+        for p in board.players:
+            if p.name == req.player:
+                player = p
+                break
+        
+        if not player:
+            raise HTTPException(status_code=400, detail="Player not found")
+        
+        if not player.in_jail:
+            raise HTTPException(status_code=400, detail="Player is not in jail")
+        
+        if req.action == "use_card":
+            success = player.use_get_out_of_jail_free_card()
+            if success:
+                return {"success": True, "message": f"{req.player} used a Get Out of Jail Free card!"}
+            else:
+                return {"success": False, "message": "No Get Out of Jail Free cards available"}
+        
+        elif req.action == "pay_fine":
+            success = player.pay_jail_fine()
+            if success:
+                return {"success": True, "message": f"{req.player} paid $50 fine and got out of jail!"}
+            else:
+                return {"success": False, "message": "Insufficient funds to pay jail fine"}
+        
         else:
-            return {"success": False, "message": "Insufficient funds to pay jail fine"}
+            raise HTTPException(status_code=400, detail="Invalid action. Use 'use_card' or 'pay_fine'")
     
-    else:
-        raise HTTPException(status_code=400, detail="Invalid action. Use 'use_card' or 'pay_fine'")
+    result, delta = await commit(game_id, apply_jail_action, with_patch=True)
+    return FastJSONResponse({**result, **delta})
 
 class ResetRequest(BaseModel):
     num_players: int
 
-@app.post("/reset")
-def post_reset(req: ResetRequest):
-    # Validate number of players
-    if not (2 <= req.num_players <= 6):
-        raise HTTPException(status_code=400, detail="Number of players must be between 2 and 6")
-    
+@game_router.post("/reset")
+async def post_reset(game_id: str, req: ResetRequest):
     num_players = req.num_players
     
     # Create the specified number of players
-    player_names = [f"Player {i+1}" for i in range(num_players)]
-    players = [Player(name=name, token=f"token_{i+1}") for i, name in enumerate(player_names)]
+    player_names = player_names_for(num_players)
     
-    # Create board and reset with the new players
-    board = MonopolyBoard(players)
-    board.reset(player_names)
+    # Reset the stored board in place (creating the game if needed) so its version keeps increasing
+    await commit(game_id, lambda board: board.reset(player_names), create=True)
     
     return {"success": True, "message": f"Game reset with {num_players} players", "players": player_names}
 
 
+class TurnPlanRequest(BaseModel):
+    player: str
+    build_before: list[int | Literal["cheapest"]] = []
+    jail_action: Optional[Literal["use_card", "pay_fine"]] = None
+    max_price: Optional[int] = None  # buy the landing space up to this price; None never buys
+    cash_reserve: int = 0
+    build_after: list[int | Literal["cheapest"]] = []
+    buy: list[int] = []  # landing spaces to buy regardless of max_price
+
+
+@game_router.post("/turn")
+async def post_turn(game_id: str, req: TurnPlanRequest):
+    """Play a whole turn (builds, roll, purchase, builds) in one transaction; see MonopolyBoard.play_turn."""
+    result, delta = await commit(game_id, lambda board: board.play_turn(
+        req.player,
+        build_before=req.build_before,
+        jail_action=req.jail_action,
+        max_price=req.max_price,
+        cash_reserve=req.cash_reserve,
+        build_after=req.build_after,
+        buy=req.buy,
+    ), with_patch=True)
+    if not result["success"]:
+        raise HTTPException(status_code=400, detail=result["message"])
+    return FastJSONResponse({**result, **delta})
+
+
 class HousePurchaseRequest(BaseModel):
     player: str
     position: int
 
-@app.post("/buy_house")
-def post_buy_house(req: HousePurchaseRequest):
-    board = MonopolyBoard.load_from_redis()
-    result = board.buy_house(req.player, req.position)
+@game_router.post("/buy_house")
+async def post_buy_house(game_id: str, req: HousePurchaseRequest):
+    result, delta = await commit(game_id, lambda board: board.buy_house(req.player, req.position), with_patch=True)
     
     if not result["success"]:
         raise HTTPException(status_code=400, detail=result["message"])
     
-    return result
+    return FastJSONResponse({**result, **delta})
 
-@app.get("/house_options/{player}")
-def get_house_options(player: str):
-    board = MonopolyBoard.load_from_redis()
+@game_router.get("/house_options/{player}")
+async def get_house_options(game_id: str, player: str, request: Request, response: Response):
+    stamp = await conditional_version(game_id, request, response)
+    board = (await load_game(game_id, stamp)).board
     options = board.get_house_buying_options(player)
-    return {"options": options}
+    return FastJSONResponse({"options": options}, headers=dict(response.headers))
 
-@app.get("/monopolies/{player}")
-def get_monopolies(player: str):
-    board = MonopolyBoard.load_from_redis()
+@game_router.get("/monopolies/{player}")
+async def get_monopolies(game_id: str, player: str, request: Request, response: Response):
+    stamp = await conditional_version(game_id, request, response)
+    board = (await load_game(game_id, stamp)).board
     monopolies = board.get_monopoly_sets(player)
     return {"monopolies": monopolies}
 
 
+@game_router.websocket("/ws")
+async def game_websocket(websocket: WebSocket, game_id: str):
+    """
+    Send the client a game's state, then a JSON Patch after every change. The client
+    may send {"type": "request_game_state"} to get a full snapshot again (e.g. after
+    missing a patch).
+    """
+    queue = await manager.connect(game_id, websocket)
+    sender = asyncio.create_task(manager.sender(game_id, websocket, queue))
+    try:
+        async for text in websocket.iter_text():
+            try:
+                request = json.loads(text)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(request, dict) and request.get("type") == "request_game_state":
+                manager.enqueue(queue, manager.RESYNC)
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        manager.disconnect(game_id, websocket)
+
+
+app.include_router(game_router)
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
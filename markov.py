@@ -0,0 +1,246 @@
+'''
+markov.py
+
+Exact landing probabilities from a Markov chain over the 40 board spaces plus the
+in-jail states. The chain follows the movement rules in player.py (two dice, GO,
+three jail attempts with doubles releasing early) and the chance.py and chest.py
+decks, moving tokens only for the cards MonopolyBoard actually carries out.
+
+Solved models are cached on disk keyed by the rule configuration, and in memory per
+process, so callers can look up probabilities without simulating.
+'''
+
+import functools
+import hashlib
+import json
+import os
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+from chance import build_chance_deck
+from chest import build_chest_deck
+
+BOARD_SIZE = 40
+JAIL_POSITION = 10
+GO_TO_JAIL_POSITION = 30
+CHANCE_POSITIONS = (7, 22, 36)
+CHEST_POSITIONS = (2, 17, 33)
+RAILROAD_POSITIONS = (5, 15, 25, 35)
+UTILITY_POSITIONS = (12, 28)
+
+# Bump when the chain construction changes so stale cache files are not reused
+MODEL_VERSION = 2
+CACHE_DIR = os.getenv("MONOPOLY_CACHE_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache"))
+
+JAIL = "jail"
+
+
+def _next_of(position: int, targets: tuple) -> int:
+    for target in targets:
+        if target > position:
+            return target
+    return targets[0]
+
+
+# Card action -> where it sends a token standing on 'position'. Actions missing here do not move it.
+CARD_MOVES = {
+    "advance_to_go": lambda position: 0,
+    "advance_to_illinois": lambda position: 24,
+    "advance_to_st_charles": lambda position: 11,
+    "advance_to_nearest_utility": lambda position: _next_of(position, UTILITY_POSITIONS),
+    "advance_to_nearest_railroad": lambda position: _next_of(position, RAILROAD_POSITIONS),
+    "go_back_three_spaces": lambda position: (position - 3) % BOARD_SIZE,
+    "trip_to_reading": lambda position: 5,
+    "walk_on_boardwalk": lambda position: 39,
+    "go_to_jail": lambda position: JAIL,
+}
+
+# The movement cards MonopolyBoard._execute_chance_action / _execute_chest_action
+# implement; the game only logs the others, so the token stays on the card space.
+# Keep in step with game_board.py, or the probabilities drift from real games.
+ENGINE_CARD_MOVES = ("advance_to_go", "go_back_three_spaces", "go_to_jail")
+
+
+@dataclass(frozen=True)
+class MarkovRules:
+    """
+    Rule configuration for the chain. Two models with equal rules share a cache entry.
+
+    Attributes:
+        max_jail_turns: Attempt on which the fine is paid and the token leaves jail.
+        chance_actions: Card actions in the Chance deck, each drawn with equal probability.
+        chest_actions: Card actions in the Community Chest deck.
+        card_movement: Apply movement cards; False models a board without card moves.
+        card_moves: Actions (keys of CARD_MOVES) that move the token. Defaults to the
+            ones the game engine implements; tuple(CARD_MOVES) models the printed cards.
+        resolve_card_targets: Play out a card space a card moves the token onto (e.g.
+            drawing again after going back three to Community Chest). The engine does
+            not, so it is off by default.
+    """
+    max_jail_turns: int = 3
+    chance_actions: tuple = tuple(card.action for card in build_chance_deck())
+    chest_actions: tuple = tuple(card.action for card in build_chest_deck())
+    card_movement: bool = True
+    card_moves: tuple = ENGINE_CARD_MOVES
+    resolve_card_targets: bool = False
+
+    def cache_key(self) -> str:
+        config = {"model_version": MODEL_VERSION, **asdict(self)}
+        return hashlib.sha256(json.dumps(config, sort_keys=True).encode()).hexdigest()[:16]
+
+    @property
+    def num_states(self) -> int:
+        # One state per space, then one per failed jail attempt so far (0 .. max_jail_turns-1)
+        return BOARD_SIZE + self.max_jail_turns
+
+
+def _resolve(position: int, rules: MarkovRules) -> dict:
+    """Distribution over end-of-turn states after a token lands on 'position'."""
+    if position == GO_TO_JAIL_POSITION:
+        return {BOARD_SIZE: 1.0}
+
+    if rules.card_movement and (position in CHANCE_POSITIONS or position in CHEST_POSITIONS):
+        actions = rules.chance_actions if position in CHANCE_POSITIONS else rules.chest_actions
+        outcome = {}
+        for action in actions:
+            move = CARD_MOVES.get(action) if action in rules.card_moves else None
+            target = move(position) if move else position
+            if target == JAIL:
+                states = {BOARD_SIZE: 1.0}
+            elif target == position or not rules.resolve_card_targets:
+                states = {target: 1.0}
+            else:
+                # The new space may itself be a card space (e.g. going back three to Community Chest)
+                states = _resolve(target, rules)
+            for state, probability in states.items():
+                outcome[state] = outcome.get(state, 0.0) + probability / len(actions)
+        return outcome
+
+    return {position: 1.0}
+
+
+def build_transition_matrix(rules: MarkovRules) -> np.ndarray:
+    """Row-stochastic matrix of one-turn transitions between the chain's states."""
+    matrix = np.zeros((rules.num_states, rules.num_states))
+    rolls = [(die1, die2) for die1 in range(1, 7) for die2 in range(1, 7)]
+    landing = {position: _resolve(position, rules) for position in range(BOARD_SIZE)}
+
+    for position in range(BOARD_SIZE):
+        if position == GO_TO_JAIL_POSITION:
+            continue
+        for die1, die2 in rolls:
+            for state, probability in landing[(position + die1 + die2) % BOARD_SIZE].items():
+                matrix[position, state] += probability / len(rolls)
+
+    for attempts in range(rules.max_jail_turns):
+        state = BOARD_SIZE + attempts
+        for die1, die2 in rolls:
+            # Doubles or the last allowed attempt (fine paid) release the token, which then moves
+            if die1 == die2 or attempts + 1 >= rules.max_jail_turns:
+                for target, probability in landing[JAIL_POSITION + die1 + die2].items():
+                    matrix[state, target] += probability / len(rolls)
+            else:
+                matrix[state, state + 1] += 1 / len(rolls)
+
+    # Go To Jail is never occupied at the end of a turn; keep its row valid anyway
+    matrix[GO_TO_JAIL_POSITION] = matrix[JAIL_POSITION]
+    return matrix
+
+
+def stationary_distribution(matrix: np.ndarray) -> np.ndarray:
+    """Solve pi = pi @ matrix with pi summing to 1."""
+    num_states = matrix.shape[0]
+    system = matrix.T - np.eye(num_states)
+    system[-1, :] = 1.0
+    rhs = np.zeros(num_states)
+    rhs[-1] = 1.0
+    return np.linalg.solve(system, rhs)
+
+
+class LandingModel:
+    """
+    A solved chain. Probabilities are per board space and count a token in jail
+    (or just visiting) as being on space 10.
+    """
+
+    def __init__(self, rules: MarkovRules, transition: np.ndarray, stationary: np.ndarray):
+        self.rules = rules
+        self.transition = transition
+        self.stationary = stationary
+        self._landing = self._to_board(stationary)
+
+    @staticmethod
+    def _to_board(distribution: np.ndarray) -> np.ndarray:
+        board = distribution[..., :BOARD_SIZE].copy()
+        board[..., JAIL_POSITION] += distribution[..., BOARD_SIZE:].sum(axis=-1)
+        return board
+
+    def landing_probabilities(self) -> np.ndarray:
+        """Long-run probability of ending a turn on each of the 40 spaces."""
+        return self._landing
+
+    def probability(self, position: int) -> float:
+        """Long-run probability of ending a turn on 'position'."""
+        return float(self._landing[position])
+
+    def in_jail_probability(self) -> float:
+        """Long-run probability of being in jail (rather than just visiting)."""
+        return float(self.stationary[BOARD_SIZE:].sum())
+
+    def transient(self, turns: int, start: int = 0) -> np.ndarray:
+        """
+        Distributions after 0..turns turns for a token starting on 'start'.
+
+        Returns:
+            np.ndarray: Shape (turns + 1, 40); row n is the distribution after n turns.
+        """
+        distribution = np.zeros(self.rules.num_states)
+        distribution[start] = 1.0
+        rows = [distribution]
+        for _ in range(turns):
+            distribution = distribution @ self.transition
+            rows.append(distribution)
+        return self._to_board(np.array(rows))
+
+
+def _cache_path(rules: MarkovRules, cache_dir: str) -> str:
+    return os.path.join(cache_dir, f"markov_{rules.cache_key()}.npz")
+
+
+@functools.lru_cache(maxsize=32)
+def solve(rules: MarkovRules = MarkovRules(), cache_dir: str = CACHE_DIR) -> LandingModel:
+    """
+    Build and solve the chain for 'rules', reading from or writing to the disk cache.
+    Repeated calls in the same process return the same LandingModel.
+    """
+    path = _cache_path(rules, cache_dir)
+    if os.path.exists(path):
+        with np.load(path) as cached:
+            return LandingModel(rules, cached["transition"], cached["stationary"])
+
+    transition = build_transition_matrix(rules)
+    stationary = stationary_distribution(transition)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # Write then rename so concurrent processes never read a half-written file
+        tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp_path, transition=transition, stationary=stationary)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Could not cache Markov model at {path}: {e}")
+    return LandingModel(rules, transition, stationary)
+
+
+def landing_probability(position: int, rules: MarkovRules = MarkovRules()) -> float:
+    """Long-run probability of ending a turn on 'position' under 'rules'."""
+    return solve(rules).probability(position)
+
+
+if __name__ == "__main__":
+    # Basic smoke-test
+    model = solve()
+    ranked = np.argsort(model.landing_probabilities())[::-1]
+    for position in ranked[:5]:
+        print(f"Position {position}: {model.probability(position):.4f}")
+    print(f"In jail: {model.in_jail_probability():.4f}")
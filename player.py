@@ -8,7 +8,7 @@ from dataclasses import dataclass, field
 from typing import List, Any
 
 
-@dataclass
+@dataclass(slots=True)
 class Player:
 
     name: str
@@ -21,6 +21,27 @@ class Player:
     jail_turns: int = 0
     bankrupt: bool = False
 
+    def to_dict(self) -> dict:
+        """Plain-dict form used for JSON/Redis serialization."""
+        return {
+            "name": self.name,
+            "token": self.token,
+            "money": self.money,
+            "position": self.position,
+            "properties": list(self.properties),
+            "get_out_of_jail_free": self.get_out_of_jail_free,
+            "in_jail": self.in_jail,
+            "jail_turns": self.jail_turns,
+            "bankrupt": self.bankrupt,
+        }
+
+    def copy(self) -> "Player":
+        """Independent copy of the player's state."""
+        return Player(
+            self.name, self.token, self.money, self.position, list(self.properties),
+            self.get_out_of_jail_free, self.in_jail, self.jail_turns, self.bankrupt,
+        )
+
     def move(self, steps: int, board_size: int = 40) -> tuple[int, bool]:
         """
         Move the player forward by 'steps'.
@@ -6,8 +6,13 @@ import redis.asyncio as aioredis
 import websockets
 import os
 import sys
-import requests
-from typing import Dict, Any, Optional
+import time
+from typing import Dict, Optional
+from state_diff import StateMirror
+from ai_client import close_ai_clients, get_ai_client
+from ai_player import BoardView, default_policy
+from ai_decisions import DecisionSchema, field, int_list, structured_decision
+from decision_cache import DecisionCache, turn_key
 
 # Load environment variables from .env file
 try:
@@ -17,8 +22,6 @@ except ImportError:
     # dotenv not installed, environment variables will be loaded from system
     pass
 
-redisPubSubKey = "monopoly_game_state_changed"
-
 # CLI argument parsing - only when run directly
 parser = argparse.ArgumentParser(description="Monopoly Game Client")
 parser.add_argument(
@@ -33,24 +36,103 @@ parser.add_argument(
 parser.add_argument(
     "--ai", action="store_true", help="Enable AI mode - uses ChatGPT to make decisions."
 )
+parser.add_argument(
+    "--game", default="default", help="Id of the game to join (or create with --reset)."
+)
+parser.add_argument(
+    "--policy", choices=["heuristic", "fixed"], default="heuristic",
+    help="How auto and --seats bots play, and what AI mode falls back to: the local heuristic policy "
+         "or the fixed rule (cheapest house, buy at $200 or less).",
+)
+
+
+def parse_seats(value: str) -> list[str]:
+    """Parse a seat list such as "1-6", "2,4" or "1-3,5" into ["1", "2", ...]."""
+    seats = set()
+    try:
+        for part in value.split(","):
+            first, _, last = part.partition("-")
+            seats.update(range(int(first), int(last or first) + 1))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid seat list: {value!r}")
+    if not seats or min(seats) < 1 or max(seats) > 6:
+        raise argparse.ArgumentTypeError("seats must be between 1 and 6")
+    return [str(seat) for seat in sorted(seats)]
+
+
+parser.add_argument(
+    "--seats", type=parse_seats,
+    help="Play these seats (e.g. 1-6 or 1,3) as auto bots from this one process, instead of --player."
+)
+parser.add_argument(
+    "--games", type=int, default=1,
+    help="With --seats, play this many tables, named <game>-1 ... <game>-N (default: just --game)."
+)
 
 # Initialize defaults for when imported as module
 args = None
 i_am_playing = None
+game_id = "default"
 WS_URL = f"ws://ai.thewcl.com:8703"
 
 # Redis Pub/Sub setup
 r = aioredis.Redis(
     host="ai.thewcl.com", port=6379, db=3, password="atmega328", decode_responses=True
 )
-redisPubSubKey = "monopoly_game_state_changed"
+
+
+def game_channel(game_id: str) -> str:
+    """
+    Pub/sub channel for one game (matches game_board.game_channel). The server
+    publishes every commit's patch on it; players add a turn_ended message when they
+    finish a turn.
+    """
+    return f"monopoly:game:{game_id}:changed"
+
+
+redisPubSubKey = game_channel(game_id)
 
 # FastAPI base URL
 BASE_URL = "http://localhost:8000"
 
-# AI Configuration
-AI_SERVER_URL = "http://ai.thewcl.com:6502"
+
+def game_url(path: str, game: Optional[str] = None) -> str:
+    """URL of a per-game endpoint, e.g. game_url("/state"), for this process's game unless 'game' is given."""
+    return f"{BASE_URL}/games/{game or game_id}{path}"
+
+# One keep-alive connection pool for every request this process makes to the server
+http_client: Optional[httpx.AsyncClient] = None
+
+
+def get_http_client() -> httpx.AsyncClient:
+    """Return the process-wide HTTP client, creating it on first use."""
+    global http_client
+    if http_client is None:
+        http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=60),
+        )
+    return http_client
+
+
+async def close_http_client():
+    global http_client
+    if http_client is not None:
+        await http_client.aclose()
+        http_client = None
+
+
+# Local copy of the game state, kept current with patches from the server
+board_mirror = StateMirror()
+board_etag = None  # ETag of the last /state response
+# Player -> (ETag, options) from the last /house_options response
+house_options_cache: Dict[str, tuple] = {}
+
+# AI Configuration (server, concurrency and latency budget are set in ai_client)
 AI_MODEL = "gpt-4.1-nano"
+# Answers the model already gave in similar positions; set MONOPOLY_DECISION_CACHE to a
+# file path to share them between processes
+decision_cache = DecisionCache(path=os.getenv("MONOPOLY_DECISION_CACHE"))
 
 
 async def get_num_players():
@@ -73,220 +155,256 @@ async def reset_board():
     # Prompt for number of players
     num_players = await get_num_players()
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{BASE_URL}/reset", json={"num_players": num_players})
-        print(f"Reset response status: {response.status_code}")
-        print(f"Reset response headers: {response.headers}")
-        print(f"Reset response content: {response.text}")
-        
-        if response.status_code == 200:
-            try:
-                if response.text.strip():  # Check if response has content
-                    result = response.json()
-                    print("Game reset:", result)
-                    print(f"\nYou can now run the following commands in separate terminal windows:")
-                    for i in range(1, num_players + 1):
-                        print(f"  uv run player_engine.py --player {i}")
-                else:
-                    print("Game reset: Empty response (success)")
-            except json.JSONDecodeError as e:
-                print(f"Failed to parse JSON response: {e}")
-                print(f"Raw response: {response.text}")
-        else:
-            print(f"Reset failed with status {response.status_code}: {response.text}")
+    response = await get_http_client().post(game_url("/reset"), json={"num_players": num_players})
+    print(f"Reset response status: {response.status_code}")
+    print(f"Reset response headers: {response.headers}")
+    print(f"Reset response content: {response.text}")
+    
+    if response.status_code == 200:
+        try:
+            if response.text.strip():  # Check if response has content
+                result = response.json()
+                print("Game reset:", result)
+                print(f"\nYou can now run the following commands in separate terminal windows:")
+                for i in range(1, num_players + 1):
+                    print(f"  uv run player_engine.py --game {game_id} --player {i}")
+            else:
+                print("Game reset: Empty response (success)")
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse JSON response: {e}")
+            print(f"Raw response: {response.text}")
+    else:
+        print(f"Reset failed with status {response.status_code}: {response.text}")
 
 
 async def get_board():
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/state")
-        if response.status_code == 200:
-            try:
-                return response.json()
-            except json.JSONDecodeError as e:
-                print(f"Failed to parse JSON response from /state: {e}")
-                print(f"Raw response: {response.text}")
-                return None
-        else:
-            print(f"Failed to get board state: {response.status_code} - {response.text}")
+    global board_etag
+    # Only ask for the changes since the state we already have, and nothing at all if
+    # the game has not changed
+    since = board_mirror.version
+    params = {"since": since, "epoch": board_mirror.epoch} if since is not None else None
+    headers = {"If-None-Match": board_etag} if board_etag and since is not None else None
+    response = await get_http_client().get(game_url("/state"), params=params, headers=headers)
+    if response.status_code == 304:
+        return board_mirror.state
+    if response.status_code == 200:
+        try:
+            message = response.json()
+            board_mirror.apply(message if since is not None else {"state": message})
+            board_etag = response.headers.get("ETag")
+            return board_mirror.state
+        except json.JSONDecodeError as e:
+            print(f"Failed to parse JSON response from /state: {e}")
+            print(f"Raw response: {response.text}")
             return None
+    else:
+        print(f"Failed to get board state: {response.status_code} - {response.text}")
+        return None
+
+
+async def current_board():
+    """
+    The local board, fetched only if there is no copy yet. Our own actions keep it
+    current; call get_board() to pick up other players' changes.
+    """
+    if board_mirror.state is not None:
+        return board_mirror.state
+    return await get_board()
+
+
+async def post_action(path, payload):
+    """POST a game action; the patch in its response keeps board_mirror current."""
+    response = await get_http_client().post(game_url(path), json=payload)
+    if response.status_code == 200 and not board_mirror.apply(response.json()):
+        # Someone else changed the game since our last look; catch up from the server
+        await get_board()
+    return response
 
 
 async def post_move(player):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}/move", json={"player": player, "index": 0}
-        )
-        return response
+    return await post_action("/move", {"player": player, "index": 0})
 
 
-async def make_ai_request(prompt: str, system_prompt: str = None) -> str:
+async def make_ai_request(prompt: str, system_prompt: str = None, max_tokens: Optional[int] = None) -> Optional[str]:
     """
-    Make a request to the ChatGPT API through the ai.thewcl.com server.
+    Ask the AI through the shared ai_client, within its latency budget.
     
     Args:
         prompt: The user prompt for ChatGPT
         system_prompt: Optional system prompt to set context
+        max_tokens: Longest reply to allow
         
     Returns:
-        str: The AI's response
+        Optional[str]: The AI's response, or None if it did not answer in time (or
+        failed), in which case the caller decides with a local heuristic
     """
-    api_key = os.getenv('OPENAI_API_KEY')
-    if not api_key:
-        print("Warning: No OpenAI API key found. Using fallback decision.")
-        return "I'll make a conservative choice."
-    
-    try:
-        payload = {
-            "model": AI_MODEL,
-            "system_prompt": system_prompt or "You are an AI playing Monopoly. Make strategic decisions based on the game state.",
-            "user_prompt": prompt
-        }
-        
-        headers = {
-            "Content-Type": "application/json",
-            "Authorization": f"Bearer {api_key}"
-        }
-        
-        def sync_request():
-            response = requests.post(
-                f"{AI_SERVER_URL}/chat",
-                json=payload,
-                headers=headers,
-                timeout=30
-            )
-            return response
-        
-        loop = asyncio.get_event_loop()
-        response = await loop.run_in_executor(None, sync_request)
-        
-        if response.status_code == 200:
-            result = response.json()
-            # Parse the actual API response format
-            if isinstance(result, dict):
-                # Try to extract from the actual API format
-                if "output" in result and len(result["output"]) > 0:
-                    output = result["output"][0]
-                    if "content" in output and len(output["content"]) > 0:
-                        content = output["content"][0]
-                        if "text" in content:
-                            return content["text"].strip()
-                # Fallback to other possible formats
-                if "content" in result:
-                    return result["content"].strip()
-                elif "response" in result:
-                    return result["response"].strip()
-                else:
-                    # If it's just a string response
-                    return str(result).strip()
-            else:
-                # If it's a string response
-                return str(result).strip()
-        else:
-            print(f"AI API Error: {response.status_code} - {response.text}")
-            return "I need to think about this more carefully."
-            
-    except Exception as e:
-        print(f"Error making AI request: {e}")
-        return "I'll make a conservative choice."
+    return await get_ai_client().chat(prompt, system_prompt, model=AI_MODEL, max_tokens=max_tokens)
 
 
-async def ai_decide_purchase(player: str, property_info: Dict[str, Any]) -> bool:
+# The fixed rule's turn (--policy fixed): cheapest house, roll, buy if $200 or less
+AUTO_TURN_PLAN = {"build_before": ["cheapest"], "max_price": 200}
+
+
+def local_turn_plan(board, player: str) -> dict:
+    """
+    The bot's own /turn plan for 'player', decided locally in microseconds: the
+    heuristic policy's (see ai_player.HeuristicPolicy), or the fixed rule's with
+    --policy fixed or without a board.
     """
-    Use AI to decide whether to purchase a property.
+    if board is None or args.policy == "fixed":
+        return AUTO_TURN_PLAN
+    return default_policy().plan_turn(BoardView.from_state(board), player)
 
-    Args:
-        player: Player's name
-        property_info: Information about the property
 
-    Returns:
-        bool: Decision to purchase (True/False)
+async def post_turn(player, plan=None):
+    """Play a whole turn in one request, by 'plan' (see the /turn endpoint) or the fixed plan."""
+    return await post_action("/turn", {"player": player, **(plan or AUTO_TURN_PLAN)})
+
+
+def player_cash(board, player: str) -> int:
+    for p in board["players"]:
+        if p["name"] == player:
+            return p["money"]
+    return 0
+
+
+def group_ownership(board, player: str, position: int) -> tuple[int, int]:
+    """
+    How many of the other properties in the same color group (or railroads, or
+    utilities) as 'position' are owned by 'player', and how many by opponents.
     """
-    prompt = f"Player {player}, should you buy {property_info['name']} for ${property_info['buy_price']}? Respond with 'yes' or 'no'."
-    response = await make_ai_request(prompt)
-    return 'yes' in response.lower()
+    for kind in ("regular_properties", "railroad_properties", "utility_properties"):
+        properties = board[kind]
+        target = next((prop for prop in properties if prop["position"] == position), None)
+        if target is None:
+            continue
+        group = [prop for prop in properties
+                 if prop["position"] != position and prop.get("color") == target.get("color")]
+        mine = sum(1 for prop in group if prop["owner"] == player)
+        others = sum(1 for prop in group if prop["owner"] not in (None, player))
+        return mine, others
+    return 0, 0
 
 
 async def post_purchase_decision(player, position, decision):
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}/purchase", json={"player": player, "position": position, "decision": decision}
-        )
-        return response
+    return await post_action("/purchase", {"player": player, "position": position, "decision": decision})
 
 
-async def ai_decide_house_purchase(player, options):
-    """Use AI to decide which house to buy from available options.
-    
-    Args:
-        player: The player name
-        options: List of house buying options
-    
-    Returns:
-        The selected option dict, or None if AI decides not to buy
-    """
-    if not options:
-        return None
-    
-    # Get current board state for better AI decision making
-    board = await get_board()
-    player_index = int(player.split()[-1]) - 1  # Extract player number
-    player_money = 0
-    
-    if board and board.get("players") and 0 <= player_index < len(board["players"]):
-        player_money = board["players"][player_index]["money"]
-    
-    # Format options for AI prompt
-    options_text = "\n".join([f"{i+1}. {option['description']} (Cost: ${option['house_cost']})" 
-                              for i, option in enumerate(options)])
-    
-    prompt = f"""You are Player {player} in a Monopoly game. You have ${player_money} in cash.
+def reachable_properties(board, position: int) -> list[dict]:
+    """Unowned properties a roll of 2-12 from 'position' can land on, nearest first."""
+    spaces = {prop["position"]: prop for kind in ("regular_properties", "railroad_properties", "utility_properties")
+              for prop in board[kind]}
+    reachable = []
+    for roll in range(2, 13):
+        prop = spaces.get((position + roll) % 40)
+        if prop is not None and prop["owner"] is None:
+            reachable.append(prop)
+    return reachable
 
-You have the following house buying options:
-{options_text}
 
-Consider your current financial situation and strategic position. Which house should you buy, if any?
+def validate_turn_plan(reply: dict, context) -> dict:
+    """
+    Check the AI's turn plan against what this turn actually allows. Builds and
+    purchases that are not on offer, and impossible jail actions, are dropped; a
+    reply with missing or mistyped fields is rejected. 'context' is (our player,
+    house options, reachable unowned properties, the board's regular_properties).
+    """
+    me, options, reachable, streets = context
+    buildable = {option["position"] for option in options}
+    # After the roll, a group completed by this turn's purchase may be built on too
+    colors = {prop.get("color") for prop in reachable} - {None}
+    buildable_after = buildable | {prop["position"] for prop in streets if prop["color"] in colors}
+    jail_actions = {"pay_fine"} | ({"use_card"} if me["get_out_of_jail_free"] > 0 else set())
+    jail_action = reply.get("jail_action")
+    if jail_action is not None and not isinstance(jail_action, str):
+        raise ValueError('"jail_action" must be null or a string')
+    cash_reserve = field(reply, "cash_reserve", int)
+    return {
+        "build_before": int_list(reply, "build_before", buildable),
+        "jail_action": jail_action if me["in_jail"] and jail_action in jail_actions else None,
+        "buy": int_list(reply, "buy", {prop["position"] for prop in reachable}),
+        "cash_reserve": min(max(cash_reserve, 0), me["money"]),
+        # The server skips builds after the roll that are still not allowed by then
+        "build_after": int_list(reply, "build_after", buildable_after),
+    }
+
+
+TURN_PLAN = DecisionSchema(
+    "turn plan",
+    '{"build_before":[positions to build a house on before rolling, in order],"jail_action":null|"use_card"|"pay_fine",'
+    '"buy":[positions to buy if you land on them],"cash_reserve":cash to keep after any purchase or build,'
+    '"build_after":[positions to build a house on after moving, in order]}',
+    validate_turn_plan,
+    max_tokens=80,
+)
 
-Respond with either:
-- The number of the option you want to buy (1, 2, 3, etc.)
-- "none" if you don't want to buy any houses
 
-Your response:"""
-    
-    response = await make_ai_request(prompt)
-    
-    # Parse AI response
-    response_lower = response.lower().strip()
-    
-    if "none" in response_lower:
-        return None
+async def ai_plan_turn(player: str) -> dict:
+    """
+    Ask the AI for every decision of a turn in one call: houses to build before and
+    after the roll, a jail action, which landing spaces to buy and how much cash to
+    keep. Returns a /turn plan, or the local policy's plan if the AI does not answer
+    in time or its answer is not a usable plan.
+    """
+    board = await current_board()
+    options = await get_house_options(player)
+    me = next((p for p in board["players"] if p["name"] == player), None) if board else None
+    if me is None:
+        return AUTO_TURN_PLAN
+    reachable = reachable_properties(board, me["position"])
+    ownership = [group_ownership(board, player, prop["position"]) for prop in reachable]
     
-    # Try to extract option number
-    for i, option in enumerate(options, 1):
-        if str(i) in response_lower:
-            return option
+    options_text = "\n".join(f"- position {option['position']}: {option['description']}" for option in options) or "- none"
+    reachable_text = "\n".join(
+        f"- position {prop['position']}: {prop['name']}, ${prop['buy_price']}"
+        f" ({prop.get('color') or ('Railroads' if prop in board['railroad_properties'] else 'Utilities')};"
+        f" you own {mine} of the others in its group, opponents own {others})"
+        for prop, (mine, others) in zip(reachable, ownership)
+    ) or "- none"
+    jail_text = (f"You are in jail (turn {me['jail_turns'] + 1}) with {me['get_out_of_jail_free']} Get Out of Jail Free cards."
+                 if me["in_jail"] else "You are not in jail.")
+    prompt = f"""You are {player} in a Monopoly game, deciding your whole turn at once.
+You have ${me['money']} in cash and are on position {me['position']}. {jail_text}
+
+Houses you can build now:
+{options_text}
+
+Unowned properties you could land on this roll:
+{reachable_text}"""
     
-    # If no clear choice, default to None (don't buy)
-    return None
+    cache_key = turn_key(
+        options, [(prop["position"], *owned) for prop, owned in zip(reachable, ownership)], me["money"],
+        (me["in_jail"], me["jail_turns"], me["get_out_of_jail_free"] > 0),
+    )
+    plan = await structured_decision(
+        lambda prompt, max_tokens: make_ai_request(prompt, max_tokens=max_tokens),
+        prompt, TURN_PLAN, (me, options, reachable, board["regular_properties"]), decision_cache, cache_key,
+    )
+    if plan is None:
+        print("🤖 No usable plan from the AI, playing the local policy's turn")
+        return local_turn_plan(board, player)
+    return plan
 
 
 async def get_house_options(player):
     """Get house buying options for a player."""
-    async with httpx.AsyncClient() as client:
-        response = await client.get(f"{BASE_URL}/house_options/{player}")
-        if response.status_code == 200:
-            return response.json().get("options", [])
-        else:
-            print(f"Failed to get house options: {response.status_code} - {response.text}")
-            return []
+    etag, options = house_options_cache.get(player, (None, None))
+    headers = {"If-None-Match": etag} if etag else None
+    response = await get_http_client().get(game_url(f"/house_options/{player}"), headers=headers)
+    if response.status_code == 304:
+        return options
+    if response.status_code == 200:
+        options = response.json().get("options", [])
+        house_options_cache[player] = (response.headers.get("ETag"), options)
+        return options
+    else:
+        print(f"Failed to get house options: {response.status_code} - {response.text}")
+        return []
 
 
 async def buy_house(player, position):
     """Buy a house for a player at a specific position."""
-    async with httpx.AsyncClient() as client:
-        response = await client.post(
-            f"{BASE_URL}/buy_house", json={"player": player, "position": position}
-        )
-        return response
+    return await post_action("/buy_house", {"player": player, "position": position})
 
 
 async def get_user_house_decision(options):
@@ -344,21 +462,8 @@ async def handle_house_buying(player_name):
         return  # No options available
     
     if args.ai:
-        # AI mode - use AI to decide which house to buy
-        print(f"🤖 AI considering house purchases for {player_name}...")
-        selected_option = await ai_decide_house_purchase(player_name, options)
-        
-        if selected_option:
-            print(f"🤖 AI buying house: {selected_option['description']}")
-            
-            response = await buy_house(player_name, selected_option['position'])
-            if response.status_code == 200:
-                result = response.json()
-                print(f"🤖 {result.get('message', '')}")
-            else:
-                print(f"🤖 Failed to buy house: {response.status_code} - {response.text}")
-        else:
-            print(f"🤖 AI decided not to buy any houses")
+        # AI mode builds as part of its turn plan (see ai_plan_turn)
+        return
     elif not args.auto:
         # Manual mode - ask user
         selected_option = await get_user_house_decision(options)
@@ -374,7 +479,7 @@ async def handle_house_buying(player_name):
                 print(f"Failed to buy house: {response.status_code} - {response.text}")
     else:
         # Auto mode - simple logic: buy cheapest house if enough money
-        board = await get_board()
+        board = await current_board()
         if board and board.get("players"):
             player_index = int(player_name.split()[-1]) - 1  # Extract player number
             if 0 <= player_index < len(board["players"]):
@@ -441,7 +546,7 @@ async def wait_for_user_input(message="\nPress Enter to continue..."):
 
 async def display_current_player_money():
     """Display the current player's money and owned properties"""
-    board = await get_board()
+    board = await current_board()
     if board and board.get("players"):
         player_index = int(i_am_playing) - 1  # Convert to 0-based index
         if 0 <= player_index < len(board["players"]):
@@ -477,7 +582,7 @@ async def display_current_player_money():
 
 
 async def send_positions_over_websocket(websocket):
-    board = await get_board()
+    board = await current_board()
     if board is None:
         print("Cannot send positions - failed to get board state")
         return
@@ -487,8 +592,9 @@ async def send_positions_over_websocket(websocket):
         await websocket.send(json.dumps({"positions": positions}))
 
 
-async def handle_board_state(websocket, wait_for_start=False, publish_update=True):
-    board = await get_board()
+async def handle_board_state(websocket, wait_for_start=False, publish_update=True, board=None):
+    if board is None:
+        board = await get_board()
     
     if board is None:
         print("Failed to get board state")
@@ -499,13 +605,35 @@ async def handle_board_state(websocket, wait_for_start=False, publish_update=Tru
         return False  # Return False to indicate no move was made
 
     current_turn_player = str(board["player_turn"] + 1)
-    if current_turn_player == i_am_playing:
+    if current_turn_player == i_am_playing and (args.auto or args.ai):
+        # Auto and AI mode: the server plays the whole turn in one transaction, from
+        # the local policy's plan or one model call's plan
+        player_name = f"Player {i_am_playing}"
+        if args.ai:
+            print(f"🤖 AI is planning {player_name}'s turn...")
+            plan = await ai_plan_turn(player_name)
+            print(f"🤖 AI plan: {plan}")
+        else:
+            plan = local_turn_plan(board, player_name)
+        print("Rolling Dice...")
+        response = await post_turn(player_name, plan)
+        if response.status_code == 200:
+            result = response.json()
+            print(result.get("message", ""))
+            for action in result.get("actions", []):
+                print(action)
+            if publish_update:
+                await announce_turn_end()
+            await send_positions_over_websocket(websocket)
+            return True
+        print(f"Turn failed with status {response.status_code}: {response.text}")
+    elif current_turn_player == i_am_playing:
         # Check for house buying opportunities at the start of turn
         player_name = f"Player {i_am_playing}"
         await handle_house_buying(player_name)
         
         # Wait for user to press Enter to start their turn (first prompt)
-        if wait_for_start and not args.auto and not args.ai:
+        if wait_for_start:
             await wait_for_user_input("\nIt's your turn, press Enter to roll: ")
         
         print("Rolling Dice...")
@@ -531,13 +659,7 @@ async def handle_board_state(websocket, wait_for_start=False, publish_update=Tru
                     current_position = space_details.get("position")
                     
                     # Ask for purchase decision
-                    if args.ai:
-                        # AI mode - use ChatGPT to make decision
-                        print(f"🤖 AI is deciding whether to buy {property_name} for ${buy_price}...")
-                        ai_decision = await ai_decide_purchase(player_name, space_details)
-                        decision = "y" if ai_decision else "n"
-                        print(f"🤖 AI decision: {decision} for {property_name} at ${buy_price}")
-                    elif not args.auto:
+                    if not args.auto:
                         decision = await get_user_purchase_decision(f"Do you want to buy {property_name} for ${buy_price}?")
                     else:
                         # Auto mode - make a simple decision based on price
@@ -559,7 +681,7 @@ async def handle_board_state(websocket, wait_for_start=False, publish_update=Tru
                 
                 # Only publish update if explicitly requested (for auto mode or after manual turn end)
                 if publish_update:
-                    await r.publish(redisPubSubKey, "update")
+                    await announce_turn_end()
                 await send_positions_over_websocket(websocket)
                 return True  # Return True to indicate we made a move
             except json.JSONDecodeError as e:
@@ -574,6 +696,38 @@ async def handle_board_state(websocket, wait_for_start=False, publish_update=Tru
     return False  # Return False to indicate we didn't make a move
 
 
+async def announce_turn_end():
+    """Tell the other players this turn is over, and at which version of the game."""
+    await r.publish(redisPubSubKey, json.dumps(
+        {"type": "turn_ended", "player": f"Player {i_am_playing}", "version": board_mirror.version}
+    ))
+
+
+async def on_game_message(data):
+    """
+    Apply a message from the game's channel to board_mirror, fetching from the server
+    only if a patch was missed. Returns True for a turn_ended message, once the
+    mirror has reached the version it names.
+    """
+    try:
+        message = json.loads(data)
+    except json.JSONDecodeError:
+        # A bare "update" from an older client
+        message = {"type": "turn_ended"}
+    
+    if message.get("type") in ("game_state_patch", "game_deleted"):
+        if not board_mirror.apply(message):
+            await get_board()
+        return False
+    
+    if message.get("type") == "turn_ended":
+        version = message.get("version")
+        if board_mirror.version is None or version is None or board_mirror.version < version:
+            await get_board()
+        return True
+    return False
+
+
 async def listen_for_updates_manual(websocket):
     """Manual step-through mode - two prompts per turn: start turn and end turn"""
     pubsub = r.pubsub()
@@ -589,31 +743,31 @@ async def listen_for_updates_manual(websocket):
     board = await get_board()
     if board and board["state"] == "is_playing":
         current_turn_player = str(board["player_turn"] + 1)
-        i_made_move = await handle_board_state(websocket, wait_for_start=(current_turn_player == i_am_playing), publish_update=False)
+        i_made_move = await handle_board_state(websocket, wait_for_start=(current_turn_player == i_am_playing), publish_update=False, board=board)
         # Second prompt: wait for Enter to end turn after making a move
         if i_made_move and not args.auto and not args.ai:
             await display_current_player_money()
             await wait_for_user_input("\nPress Enter to end your turn: ")
-            # Now publish the update to notify the other player
-            await r.publish(redisPubSubKey, "update")
+            # Now tell the other players it's their turn
+            await announce_turn_end()
         elif i_made_move and args.ai:
             # AI mode: show money but auto-continue
             await display_current_player_money()
             print("🤖 AI ending turn automatically...")
-            # Now publish the update to notify the other player
-            await r.publish(redisPubSubKey, "update")
+            # Now tell the other players it's their turn
+            await announce_turn_end()
         elif i_made_move and args.auto:
             # Auto mode: show money
             await display_current_player_money()
 
     try:
         async for message in pubsub.listen():
-            if message["type"] == "message":
+            if message["type"] == "message" and await on_game_message(message["data"]):
                 print("\nReceived update!")
-                board = await get_board()
+                board = board_mirror.state
                 if board and board["state"] == "is_playing":
                     current_turn_player = str(board["player_turn"] + 1)
-                    i_made_move = await handle_board_state(websocket, wait_for_start=(current_turn_player == i_am_playing), publish_update=False)
+                    i_made_move = await handle_board_state(websocket, wait_for_start=(current_turn_player == i_am_playing), publish_update=False, board=board)
                     # Second prompt: wait for Enter to end turn after making a move
                     if i_made_move and not args.auto and not args.ai:
                         await display_current_player_money()
@@ -622,18 +776,15 @@ async def listen_for_updates_manual(websocket):
                         await handle_house_buying(f"Player {i_am_playing}")
                         
                         await wait_for_user_input("\nPress Enter to end your turn: ")
-                        # Now publish the update to notify the other player
-                        await r.publish(redisPubSubKey, "update")
+                        # Now tell the other players it's their turn
+                        await announce_turn_end()
                     elif i_made_move and args.ai:
-                        # AI mode: show money but auto-continue
+                        # AI mode: show money but auto-continue (its plan already built houses)
                         await display_current_player_money()
                         
-                        # AI house buying
-                        await handle_house_buying(f"Player {i_am_playing}")
-                        
                         print("🤖 AI ending turn automatically...")
-                        # Now publish the update to notify the other player
-                        await r.publish(redisPubSubKey, "update")
+                        # Now tell the other players it's their turn
+                        await announce_turn_end()
                     elif i_made_move and args.auto:
                         # Auto mode: show money and handle house buying
                         await display_current_player_money()
@@ -642,7 +793,7 @@ async def listen_for_updates_manual(websocket):
                         await handle_house_buying(f"Player {i_am_playing}")
                 else:
                     # Game over or other state, just handle normally
-                    await handle_board_state(websocket)
+                    await handle_board_state(websocket, board=board)
     except asyncio.CancelledError:
         print("\nConnection cancelled.")
     except Exception as e:
@@ -665,9 +816,9 @@ async def listen_for_updates(websocket):
 
     try:
         async for message in pubsub.listen():
-            if message["type"] == "message":
+            if message["type"] == "message" and await on_game_message(message["data"]):
                 print("\nReceived update!")
-                await handle_board_state(websocket)
+                await handle_board_state(websocket, board=board_mirror.state)
     except asyncio.CancelledError:
         print("\nConnection cancelled.")
     except Exception as e:
@@ -681,7 +832,151 @@ async def listen_for_updates(websocket):
         await pubsub.aclose()
 
 
+class BotTable:
+    """
+    One game played by run_tables: a mirror of its state, the seats this process
+    plays in it, and a task that plays those seats' turns with POST /turn.
+
+    The dispatcher applies the game's pub/sub messages to the mirror and wakes the
+    task on turn_ended; the task does nothing unless the turn belongs to one of
+    its seats. After each turn it publishes turn_ended like a single-seat player.
+    A failed turn is retried after catching up, with exponential backoff, and the
+    table gives up after TURN_RETRIES failures in a row.
+    """
+    TURN_RETRIES = 5
+    RETRY_DELAY = 0.2  # seconds before the first retry; doubles each time
+
+    def __init__(self, game: str, seats: list[str]):
+        self.game = game
+        self.seats = seats
+        self.mirror = StateMirror()
+        self.stale = True  # the mirror missed a patch (or was never loaded)
+        self.wake = asyncio.Event()
+        self.wake.set()
+        self.turns = 0
+
+    def on_message(self, data: str):
+        try:
+            message = json.loads(data)
+        except json.JSONDecodeError:
+            # A bare "update" from an older client
+            message = {"type": "turn_ended"}
+        if message.get("type") in ("game_state_patch", "game_deleted"):
+            if not self.mirror.apply(message) or self.mirror.state is None:
+                self.stale = True
+        elif message.get("type") == "turn_ended":
+            version = message.get("version")
+            if self.mirror.version is None or version is None or self.mirror.version < version:
+                self.stale = True
+            self.wake.set()
+
+    async def catch_up(self):
+        since = self.mirror.version
+        response = await get_http_client().get(
+            game_url("/state", self.game), params={"since": since, "epoch": self.mirror.epoch} if since is not None else None
+        )
+        response.raise_for_status()
+        message = response.json()
+        # A since= response is either a patch from our version or a whole state
+        self.mirror.apply(message if since is not None else {"state": message})
+        self.stale = False
+
+    async def play(self):
+        failures = 0
+        while True:
+            await self.wake.wait()
+            self.wake.clear()
+            while True:
+                error = None
+                try:
+                    if self.stale:
+                        await self.catch_up()
+                    board = self.mirror.state
+                    if board["state"] != "is_playing":
+                        return
+                    seat = str(board["player_turn"] + 1)
+                    if seat not in self.seats:
+                        break
+                    player = f"Player {seat}"
+                    response = await get_http_client().post(
+                        game_url("/turn", self.game), json={"player": player, **local_turn_plan(board, player)},
+                    )
+                    if response.status_code != 200:
+                        error = f"Turn for {player} failed with status {response.status_code}: {response.text}"
+                except httpx.HTTPError as e:
+                    error = f"{type(e).__name__}: {e}"
+                if error is not None:
+                    # Nobody else may wake this table (e.g. when this process plays every
+                    # seat), so resync and try again here rather than waiting
+                    failures += 1
+                    if failures > self.TURN_RETRIES:
+                        raise RuntimeError(f"Giving up after {failures} failures: {error}")
+                    delay = self.RETRY_DELAY * 2 ** (failures - 1)
+                    print(f"[{self.game}] {error}; retrying in {delay:.1f}s")
+                    self.stale = True
+                    await asyncio.sleep(delay)
+                    continue
+                failures = 0
+                self.stale = not self.mirror.apply(response.json())
+                self.turns += 1
+                await r.publish(game_channel(self.game), json.dumps(
+                    {"type": "turn_ended", "player": player, "version": self.mirror.version}
+                ))
+
+
+async def run_tables(games: list[str], seats: list[str], reset: bool = False):
+    """
+    Play 'seats' in every game in 'games' from this process, over one HTTP
+    connection pool and one pub/sub connection, until every game is over.
+    """
+    if reset:
+        players = max(2, int(seats[-1]))
+        for game in games:
+            response = await get_http_client().post(game_url("/reset", game), json={"num_players": players})
+            response.raise_for_status()
+    
+    tables = {game_channel(game): BotTable(game, seats) for game in games}
+    pubsub = r.pubsub()
+    await pubsub.subscribe(*tables)
+    print(f"Playing seats {', '.join(seats)} in {len(games)} game(s)...")
+    
+    async def dispatch():
+        async for message in pubsub.listen():
+            if message["type"] == "message":
+                tables[message["channel"]].on_message(message["data"])
+    
+    started = time.monotonic()
+    dispatcher = asyncio.create_task(dispatch())
+    
+    async def play(table: BotTable):
+        try:
+            await table.play()
+            print(f"[{table.game}] Game over after {table.turns} turns by this process.")
+        except Exception as e:
+            print(f"[{table.game}] Stopped: {e}")
+    
+    try:
+        await asyncio.gather(*(play(table) for table in tables.values()))
+    finally:
+        dispatcher.cancel()
+        await pubsub.unsubscribe()
+        await pubsub.aclose()
+    
+    turns = sum(table.turns for table in tables.values())
+    elapsed = time.monotonic() - started
+    print(f"Played {turns} turns in {elapsed:.1f}s ({turns / max(elapsed, 1e-9):.0f} turns/s).")
+
+
 async def main():
+    if args.seats:
+        games = [args.game] if args.games == 1 else [f"{args.game}-{i}" for i in range(1, args.games + 1)]
+        try:
+            await run_tables(games, args.seats, reset=args.reset)
+        finally:
+            await close_http_client()
+            await r.aclose()
+        return
+    
     if args.reset:
         await reset_board()
         return
@@ -696,18 +991,27 @@ async def main():
         print("\nExiting gracefully...")
     except Exception as e:
         print(f"\nError: {e}")
+    finally:
+        await close_http_client()
+        if args.ai:
+            await close_ai_clients()
+            print(f"AI decision cache: {decision_cache.hits} hits, {decision_cache.misses} misses")
 
 
 if __name__ == "__main__":
     args = parser.parse_args()
     
     # Validate arguments
-    if not args.reset and not args.player:
-        parser.error("--player is required when not using --reset")
+    if args.seats and (args.player or args.ai):
+        parser.error("--seats plays auto bots and cannot be combined with --player or --ai")
+    if not args.reset and not args.player and not args.seats:
+        parser.error("--player or --seats is required when not using --reset")
     
     i_am_playing = args.player
+    game_id = args.game
+    redisPubSubKey = game_channel(game_id)
     
-    if not args.reset:
+    if not args.reset and not args.seats:
         print(f"Connecting to WebSocket server at {WS_URL}")
     
     try:
@@ -1,6 +1,6 @@
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class RegularProperty:
     name: str
     color: str
@@ -12,10 +12,26 @@ class RegularProperty:
     owner: str = None
     mortgaged: bool = False
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "color": self.color,
+            "buy_price": self.buy_price,
+            "rent_price": list(self.rent_price),
+            "house_hotel_price": self.house_hotel_price,
+            "position": self.position,
+            "house_count": self.house_count,
+            "owner": self.owner,
+            "mortgaged": self.mortgaged,
+        }
+    
+    def copy(self) -> "RegularProperty":
+        return RegularProperty(self.name, self.color, self.buy_price, self.rent_price, self.house_hotel_price, self.position, self.house_count, self.owner, self.mortgaged)
+    
     def __str__(self):
         return f"{self.name} - {self.buy_price} - {self.rent_price} - {self.house_hotel_price} - {self.house_count} - {self.owner} - {self.mortgaged}"
     
-@dataclass
+@dataclass(slots=True)
 class RailroadProperty:
     name: str
     buy_price: int
@@ -24,10 +40,23 @@ class RailroadProperty:
     owner: str = None
     mortgaged: bool = False
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "buy_price": self.buy_price,
+            "rent_price": list(self.rent_price),
+            "position": self.position,
+            "owner": self.owner,
+            "mortgaged": self.mortgaged,
+        }
+    
+    def copy(self) -> "RailroadProperty":
+        return RailroadProperty(self.name, self.buy_price, self.rent_price, self.position, self.owner, self.mortgaged)
+    
     def __str__(self):
         return f"{self.name} - {self.buy_price} - {self.rent_price} - {self.owner} - {self.mortgaged}"
     
-@dataclass
+@dataclass(slots=True)
 class UtilityProperty:
     name: str
     buy_price: int
@@ -36,23 +65,50 @@ class UtilityProperty:
     owner: str = None
     mortgaged: bool = False
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "buy_price": self.buy_price,
+            "rent_price": list(self.rent_price),
+            "position": self.position,
+            "owner": self.owner,
+            "mortgaged": self.mortgaged,
+        }
+    
+    def copy(self) -> "UtilityProperty":
+        return UtilityProperty(self.name, self.buy_price, self.rent_price, self.position, self.owner, self.mortgaged)
+    
     def __str__(self):
         return f"{self.name} - {self.buy_price} - {self.rent_price} - {self.owner} - {self.mortgaged}"
     
-@dataclass
+@dataclass(slots=True)
 class ChestChanceSpace:
     name: str
     position: int
     chest: bool = False
     chance: bool = False
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "position": self.position,
+            "chest": self.chest,
+            "chance": self.chance,
+        }
+    
     def __str__(self):
         return f"{self.name} - Position {self.position} - Chest: {self.chest} - Chance: {self.chance}"
     
-@dataclass
+@dataclass(slots=True)
 class SpecialSpace:
     name: str
     position: int
     
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "position": self.position,
+        }
+    
     def __str__(self):
         return f"{self.name} - Position {self.position}"
@@ -0,0 +1,421 @@
+'''
+simulation.py
+
+Headless Monopoly games for bulk strategy evaluation. Games are played entirely
+in-process on MonopolyBoard with its default no-op save hook, so no Redis or HTTP
+round trips are involved.
+'''
+
+import argparse
+import csv
+import json
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+from game_board import MonopolyBoard, property_data, chance_and_chest_spaces, other_spaces
+from player import Player
+
+PROPERTY_TYPES = ("regular_property", "railroad_property", "utility_property")
+
+
+@dataclass
+class Policy:
+    """
+    Decision hooks for a simulated player. Subclass and override the choose_*/should_*
+    methods to try other strategies; the defaults mirror player_engine.py --policy fixed.
+
+    Attributes:
+        max_price: Most the player will pay for an unowned property.
+        cash_reserve: Cash the player keeps back when buying properties or houses.
+        jail_strategy: 'roll', 'pay_fine' or 'use_card' (same actions as /jail_action).
+        houses_per_turn: Most houses the player builds at the start of a turn.
+    """
+    max_price: int = 200
+    cash_reserve: int = 0
+    jail_strategy: str = "roll"
+    houses_per_turn: int = 1
+
+    def should_buy(self, board: MonopolyBoard, player: Player, space_details: dict) -> bool:
+        """Decide whether to buy the unowned property the player just landed on."""
+        price = space_details["buy_price"]
+        return price <= self.max_price and player.money - price >= self.cash_reserve
+
+    def choose_jail_action(self, board: MonopolyBoard, player: Player) -> str:
+        """Pick 'roll', 'pay_fine' or 'use_card' before rolling from jail."""
+        if self.jail_strategy == "use_card" and player.get_out_of_jail_free == 0:
+            return "roll"
+        return self.jail_strategy
+
+    def choose_house(self, board: MonopolyBoard, player: Player, options: list[dict]) -> Optional[dict]:
+        """Pick one of the get_house_buying_options entries to build on, or None to stop."""
+        if not options:
+            return None
+        cheapest_option = min(options, key=lambda x: x["house_cost"])
+        if player.money - cheapest_option["house_cost"] >= self.cash_reserve:
+            return cheapest_option
+        return None
+
+
+class LocalHeuristicPolicy(Policy):
+    """
+    Decides with ai_player.HeuristicPolicy, like player_engine.py's auto bots, as a
+    baseline for other strategies. Of the dataclass fields only houses_per_turn applies.
+    """
+
+    @staticmethod
+    def _engine():
+        # Imported on first use, so only workers playing this strategy load ai_player
+        # (and through it markov and NumPy)
+        from ai_player import BoardView, default_policy
+        return default_policy(), BoardView
+
+    def should_buy(self, board: MonopolyBoard, player: Player, space_details: dict) -> bool:
+        policy, BoardView = self._engine()
+        return policy.should_buy(BoardView.from_board(board), player.name, space_details["position"])
+
+    def choose_jail_action(self, board: MonopolyBoard, player: Player) -> str:
+        policy, BoardView = self._engine()
+        return policy.jail_action(BoardView.from_board(board), player.name)
+
+    def choose_house(self, board: MonopolyBoard, player: Player, options: list[dict]) -> Optional[dict]:
+        policy, BoardView = self._engine()
+        builds = policy.plan_builds(
+            BoardView.from_board(board), player.name, limit=1, options=[option["position"] for option in options]
+        )
+        return next((option for option in options if option["position"] in builds), None)
+
+
+STRATEGIES = {"fixed": Policy, "heuristic": LocalHeuristicPolicy}
+
+
+def _quiet(*args, **kwargs):
+    pass
+
+
+def _build_houses(board: MonopolyBoard, player: Player, policy: Policy):
+    for _ in range(policy.houses_per_turn):
+        options = board.get_house_buying_options(player.name)
+        selected_option = policy.choose_house(board, player, options)
+        if selected_option is None:
+            return
+        if not board.buy_house(player.name, selected_option["position"])["success"]:
+            return
+
+
+def _leave_jail(player: Player, action: str):
+    if action == "use_card":
+        player.use_get_out_of_jail_free_card()
+    elif action == "pay_fine":
+        player.pay_jail_fine()
+
+
+def simulate_game(
+    players: Union[int, list[str]],
+    policy: Union[Policy, list[Policy], dict[str, Policy]],
+    seed: Any = None,
+    max_turns: int = 1000,
+) -> dict:
+    """
+    Play one complete game in memory.
+
+    Args:
+        players: Number of players (named "Player 1".."Player N") or a list of names.
+        policy: One Policy for everybody, a list in seat order, or a dict keyed by name.
+        seed: Seed for the game's dice and deck shuffles; the same seed replays the same game.
+        max_turns: Stop after this many moves if nobody has won.
+
+    Returns:
+        dict: Winner (None if the turn limit was hit), number of turns, the turn each
+        player went bankrupt on, rent collected per board position and final player states.
+    """
+    if isinstance(players, int):
+        players = [f"Player {i+1}" for i in range(players)]
+    if isinstance(policy, Policy):
+        policies = {name: policy for name in players}
+    elif isinstance(policy, dict):
+        policies = policy
+    else:
+        policies = dict(zip(players, policy))
+
+    board = MonopolyBoard(players=[])
+    board.log = _quiet
+    board.rng = random.Random(seed)
+    board.reset(players)
+
+    bankruptcies = {}
+    turns = 0
+    while turns < max_turns and board.state == "is_playing":
+        player = board.players[board.player_turn]
+        player_policy = policies[player.name]
+
+        _build_houses(board, player, player_policy)
+        if player.in_jail:
+            _leave_jail(player, player_policy.choose_jail_action(board, player))
+
+        result = board.make_move(player.name, 0, include_board=False)
+        if not result["success"]:
+            break
+        turns += 1
+
+        space_details = result["space_details"]
+        if (space_details["type"] in PROPERTY_TYPES and
+                space_details["owner"] is None and
+                not player.bankrupt and
+                0 < space_details["buy_price"] <= player.money and
+                player_policy.should_buy(board, player, space_details)):
+            board.handle_property_purchase(player.name, space_details["position"], "y")
+
+        for p in board.players:
+            if p.bankrupt and p.name not in bankruptcies:
+                bankruptcies[p.name] = turns
+
+    board.check_game_over()
+    winner = board.get_winner() if board.state == "has_winner" else None
+
+    return {
+        "winner": winner,
+        "turns": turns,
+        "bankruptcies": bankruptcies,
+        "rent_collected": dict(board.rent_collected),
+        "players": [
+            {"name": p.name, "money": p.money, "bankrupt": p.bankrupt}
+            for p in board.players
+        ],
+    }
+
+
+# ----------------------------
+# Monte Carlo runner
+# ----------------------------
+
+SPACE_NAMES = {
+    space["position"]: space.get("name", group_name)
+    for spaces in (property_data, chance_and_chest_spaces, other_spaces)
+    for group_name, group in spaces.items()
+    for space in group
+}
+
+
+@dataclass
+class SimulationStats:
+    """Aggregates over many simulated games; partial stats from workers are merged together."""
+    games: int = 0
+    wins: dict = field(default_factory=dict)             # player name (or "none") -> games won
+    total_turns: int = 0
+    min_turns: Optional[int] = None
+    max_turns: Optional[int] = None
+    game_lengths: dict = field(default_factory=dict)     # turns -> number of games that length
+    bankruptcies_per_turn: dict = field(default_factory=dict)  # turn -> bankruptcies on that turn
+    rent_collected: dict = field(default_factory=dict)   # position -> total rent paid there
+
+    def add_game(self, result: dict):
+        turns = result["turns"]
+        winner = result["winner"] or "none"
+        self.games += 1
+        self.wins[winner] = self.wins.get(winner, 0) + 1
+        self.total_turns += turns
+        self.min_turns = turns if self.min_turns is None else min(self.min_turns, turns)
+        self.max_turns = turns if self.max_turns is None else max(self.max_turns, turns)
+        self.game_lengths[turns] = self.game_lengths.get(turns, 0) + 1
+        for turn in result["bankruptcies"].values():
+            self.bankruptcies_per_turn[turn] = self.bankruptcies_per_turn.get(turn, 0) + 1
+        for position, amount in result["rent_collected"].items():
+            self.rent_collected[position] = self.rent_collected.get(position, 0) + amount
+
+    def merge(self, other: "SimulationStats"):
+        self.games += other.games
+        self.total_turns += other.total_turns
+        for ours, theirs in (
+            (self.wins, other.wins),
+            (self.game_lengths, other.game_lengths),
+            (self.bankruptcies_per_turn, other.bankruptcies_per_turn),
+            (self.rent_collected, other.rent_collected),
+        ):
+            for key, value in theirs.items():
+                ours[key] = ours.get(key, 0) + value
+        if other.min_turns is not None:
+            self.min_turns = other.min_turns if self.min_turns is None else min(self.min_turns, other.min_turns)
+            self.max_turns = other.max_turns if self.max_turns is None else max(self.max_turns, other.max_turns)
+
+    def summary(self) -> dict:
+        """JSON-friendly report: win rates, game length, bankruptcies per turn and rent per property."""
+        games = self.games or 1
+        return {
+            "games": self.games,
+            "win_rates": {name: wins / games for name, wins in sorted(self.wins.items())},
+            "game_length": {
+                "mean": self.total_turns / games,
+                "min": self.min_turns,
+                "max": self.max_turns,
+                "histogram": dict(sorted(self.game_lengths.items())),
+            },
+            "bankruptcies_per_turn": dict(sorted(self.bankruptcies_per_turn.items())),
+            "rent_collected": {
+                SPACE_NAMES.get(position, f"Position {position}"): amount
+                for position, amount in sorted(self.rent_collected.items())
+            },
+        }
+
+
+def _run_chunk(job: tuple) -> SimulationStats:
+    """Worker entry point: play a contiguous range of games and return their aggregate."""
+    first_game, num_games, num_players, policy, seed, max_turns = job
+    stats = SimulationStats()
+    for game_index in range(first_game, first_game + num_games):
+        # Every game gets its own seed, so results do not depend on how games are split
+        game_seed = f"{seed}:{game_index}"
+        stats.add_game(simulate_game(num_players, policy, game_seed, max_turns))
+    return stats
+
+
+def run_simulations(
+    num_games: int,
+    num_players: int = 4,
+    policy: Optional[Policy] = None,
+    seed: Any = 0,
+    max_turns: int = 1000,
+    workers: Optional[int] = None,
+) -> SimulationStats:
+    """
+    Play num_games games split across a process pool and merge the per-worker stats.
+
+    Games are handed out in chunks (a few per worker so slow chunks even out), and
+    only the small SimulationStats aggregates travel back between processes.
+    """
+    policy = policy or Policy()
+    workers = workers or os.cpu_count() or 1
+    num_chunks = min(num_games, workers * 4) or 1
+    chunk_size, remainder = divmod(num_games, num_chunks)
+
+    jobs = []
+    first_game = 0
+    for i in range(num_chunks):
+        size = chunk_size + (1 if i < remainder else 0)
+        jobs.append((first_game, size, num_players, policy, seed, max_turns))
+        first_game += size
+
+    stats = SimulationStats()
+    if workers == 1:
+        for job in jobs:
+            stats.merge(_run_chunk(job))
+        return stats
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for chunk_stats in executor.map(_run_chunk, jobs):
+            stats.merge(chunk_stats)
+    return stats
+
+
+def write_csv(summary: dict, out):
+    """Write a summary as flat metric,key,value rows."""
+    writer = csv.writer(out)
+    writer.writerow(["metric", "key", "value"])
+    writer.writerow(["games", "", summary["games"]])
+    for name, rate in summary["win_rates"].items():
+        writer.writerow(["win_rate", name, rate])
+    for key in ("mean", "min", "max"):
+        writer.writerow(["game_length", key, summary["game_length"][key]])
+    for turns, count in summary["game_length"]["histogram"].items():
+        writer.writerow(["game_length_histogram", turns, count])
+    for turn, count in summary["bankruptcies_per_turn"].items():
+        writer.writerow(["bankruptcies_per_turn", turn, count])
+    for name, amount in summary["rent_collected"].items():
+        writer.writerow(["rent_collected", name, amount])
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Monopoly strategy simulations")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    simulate = commands.add_parser("simulate", help="Play many headless games across all cores.")
+    simulate.add_argument("--games", type=int, default=1000, help="Number of games to play.")
+    simulate.add_argument("--players", type=int, default=4, choices=range(2, 7), help="Players per game.")
+    simulate.add_argument("--workers", type=int, default=None, help="Worker processes (default: all cores).")
+    simulate.add_argument("--seed", default="0", help="Base seed; game i is seeded with '<seed>:<i>'.")
+    simulate.add_argument("--max-turns", type=int, default=1000, help="Turn limit per game.")
+    simulate.add_argument("--strategy", choices=sorted(STRATEGIES), default="fixed",
+                          help="Policy: the fixed rule set by the options below, or the local heuristic policy.")
+    simulate.add_argument("--max-price", type=int, default=200, help="Policy: most to pay for a property.")
+    simulate.add_argument("--cash-reserve", type=int, default=0, help="Policy: cash to keep back.")
+    simulate.add_argument("--jail", choices=["roll", "pay_fine", "use_card"], default="roll", help="Policy: jail action.")
+    simulate.add_argument("--houses-per-turn", type=int, default=1, help="Policy: houses built per turn.")
+    simulate.add_argument("--format", choices=["json", "csv"], default="json", help="Output format.")
+    simulate.add_argument("--output", help="Output file (default: stdout).")
+
+    landing = commands.add_parser("landing", help="Landing frequencies and cash flow from the NumPy movement kernel.")
+    landing.add_argument("--games", type=int, default=10000, help="Number of games to play at once.")
+    landing.add_argument("--players", type=int, default=4, choices=range(2, 7), help="Players per game.")
+    landing.add_argument("--turns", type=int, default=100, help="Turns per player.")
+    landing.add_argument("--seed", type=int, default=None, help="Seed for the dice.")
+    landing.add_argument("--output", help="Output file (default: stdout).")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "simulate":
+        policy = STRATEGIES[args.strategy](
+            max_price=args.max_price,
+            cash_reserve=args.cash_reserve,
+            jail_strategy=args.jail,
+            houses_per_turn=args.houses_per_turn,
+        )
+        start = time.perf_counter()
+        stats = run_simulations(args.games, args.players, policy, args.seed, args.max_turns, args.workers)
+        elapsed = time.perf_counter() - start
+        print(f"Simulated {stats.games} games in {elapsed:.1f}s", file=sys.stderr)
+
+        summary = stats.summary()
+        out = open(args.output, "w", newline="") if args.output else sys.stdout
+        try:
+            if args.format == "csv":
+                write_csv(summary, out)
+            else:
+                json.dump(summary, out, indent=2)
+                out.write("\n")
+        finally:
+            if args.output:
+                out.close()
+
+    elif args.command == "landing":
+        # NumPy is only needed for the batched kernel
+        from batch_kernel import BatchKernel
+
+        start = time.perf_counter()
+        kernel = BatchKernel(args.games, args.players, args.seed).run(args.turns)
+        elapsed = time.perf_counter() - start
+        tokens = args.games * args.players
+        print(f"Simulated {tokens * args.turns} turns in {elapsed:.1f}s", file=sys.stderr)
+
+        probabilities = kernel.landing_probabilities()
+        summary = {
+            "turns": args.turns,
+            "tokens": tokens,
+            "landing_probabilities": {
+                SPACE_NAMES.get(position, f"Position {position}") + f" ({position})": float(probabilities[position])
+                for position in range(len(probabilities))
+            },
+            "cash": {
+                "mean": float(kernel.cash.mean()),
+                "go_salary_paid": kernel.go_salary_paid,
+                "jail_fines_paid": kernel.jail_fines_paid,
+                "bankrupt": int(kernel.bankrupt.sum()),
+            },
+        }
+        out = open(args.output, "w") if args.output else sys.stdout
+        try:
+            json.dump(summary, out, indent=2)
+            out.write("\n")
+        finally:
+            if args.output:
+                out.close()
+
+
+if __name__ == "__main__":
+    main()
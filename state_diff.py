@@ -0,0 +1,175 @@
+'''
+state_diff.py
+
+Structural diffs between two JSON-style documents (dicts, lists and scalars), used to
+send only the parts of the game state that changed. Diffs come out either as JSONPath
+assignments (for RedisJSON) or as RFC 6902 JSON Patch operations (for clients).
+'''
+
+from typing import Any, Optional
+
+
+def _changed(old: Any, new: Any) -> bool:
+    # bool is an int subclass, so compare types as well as values
+    return type(old) is not type(new) or old != new
+
+
+def diff(old: Any, new: Any, path: tuple = ()) -> list[tuple[tuple, Any]]:
+    """
+    List the (path, new value) pairs that turn 'old' into 'new', where a path is a
+    tuple of dict keys and list indexes (() is the whole document).
+
+    Dicts with the same keys and lists of the same length are compared element by
+    element; anything else that differs is replaced whole at its path. A list where
+    most elements changed (e.g. a rotated card deck) is also replaced whole, which is
+    smaller than one entry per element.
+    """
+    if isinstance(old, dict) and isinstance(new, dict) and old.keys() == new.keys():
+        changes = []
+        for key, value in new.items():
+            if old[key] is not value:
+                changes.extend(diff(old[key], value, path + (key,)))
+        return changes
+
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        changes = []
+        changed_items = 0
+        for index, (old_item, new_item) in enumerate(zip(old, new)):
+            item_changes = diff(old_item, new_item, path + (index,))
+            if item_changes:
+                changed_items += 1
+                changes.extend(item_changes)
+        if changed_items * 2 > len(new):
+            return [(path, new)]
+        return changes
+
+    if _changed(old, new):
+        return [(path, new)]
+    return []
+
+
+def json_path(path: tuple) -> str:
+    """Format a diff path as JSONPath, e.g. ("players", 2, "money") -> "$.players[2].money"."""
+    return "$" + "".join(f"[{part}]" if isinstance(part, int) else f".{part}" for part in path)
+
+
+def json_pointer(path: tuple) -> str:
+    """Format a diff path as a JSON Pointer, e.g. ("players", 2, "money") -> "/players/2/money"."""
+    return "".join("/" + str(part).replace("~", "~0").replace("/", "~1") for part in path)
+
+
+def diff_paths(old: Any, new: Any) -> list[tuple[str, Any]]:
+    """
+    List the (JSONPath, new value) pairs that turn 'old' into 'new' (see diff).
+
+    Returns:
+        list[tuple[str, Any]]: e.g. [("$.players[2].money", 1350), ("$.player_turn", 3)]
+    """
+    return [(json_path(path), value) for path, value in diff(old, new)]
+
+
+def make_patch(old: Any, new: Any) -> list[dict]:
+    """
+    RFC 6902 JSON Patch turning 'old' into 'new', built from the same diff as
+    diff_paths (so every operation is a "replace").
+
+    Returns:
+        list[dict]: e.g. [{"op": "replace", "path": "/players/2/money", "value": 1350}]
+    """
+    return patch_from_diff(diff(old, new))
+
+
+def patch_from_diff(changes: list[tuple[tuple, Any]]) -> list[dict]:
+    """Turn the output of diff into JSON Patch "replace" operations."""
+    return [{"op": "replace", "path": json_pointer(path), "value": value} for path, value in changes]
+
+
+def _parse_pointer(pointer: str) -> list:
+    return [part.replace("~1", "/").replace("~0", "~") for part in pointer.split("/")[1:]]
+
+
+def apply_patch(document: Any, patch: list[dict]) -> Any:
+    """
+    Apply an RFC 6902 patch ("add", "remove" and "replace" operations) to 'document'
+    in place. Returns the patched document, which is a new object only when the
+    patch replaces the root.
+    """
+    for operation in patch:
+        parts = _parse_pointer(operation["path"])
+        op = operation["op"]
+        if not parts:
+            if op == "remove":
+                raise ValueError("Cannot remove the document root")
+            document = operation["value"]
+            continue
+
+        parent = document
+        for part in parts[:-1]:
+            parent = parent[int(part)] if isinstance(parent, list) else parent[part]
+        last = parts[-1]
+
+        if isinstance(parent, list):
+            index = len(parent) if last == "-" else int(last)
+            if op == "add":
+                parent.insert(index, operation["value"])
+            elif op == "remove":
+                del parent[index]
+            elif op == "replace":
+                parent[index] = operation["value"]
+            else:
+                raise ValueError(f"Unsupported patch operation: {op}")
+        else:
+            if op in ("add", "replace"):
+                parent[last] = operation["value"]
+            elif op == "remove":
+                del parent[last]
+            else:
+                raise ValueError(f"Unsupported patch operation: {op}")
+    return document
+
+
+class StateMirror:
+    """
+    A client's copy of a game's state, kept current from the server's delta messages:
+    {"since": v, "version": w, "epoch": e, "patch": [...]} or a full
+    {"version": w, "state": {...}}. Versions only count within an epoch, which changes
+    whenever the game is recreated. A message with version 0 says the game was deleted
+    and empties the mirror.
+    """
+
+    def __init__(self):
+        self.state: Optional[dict] = None
+
+    @property
+    def version(self) -> Optional[int]:
+        return self.state["version"] if self.state else None
+
+    @property
+    def epoch(self) -> Optional[str]:
+        return self.state.get("epoch") if self.state else None
+
+    def apply(self, message: dict) -> bool:
+        """
+        Bring the mirror up to date from 'message'. Returns False if it is a patch
+        from a version (or epoch) other than the mirror's, in which case the caller
+        should fetch a full snapshot (or a patch from mirror.version) instead.
+        """
+        if "state" in message:
+            self.state = message["state"]
+            return True
+        if message.get("version") == 0:
+            # The game was deleted; if it is recreated its versions restart at 1, so
+            # nothing in the mirror can be compared with them
+            self.state = None
+            return True
+        if self.state is None or message.get("epoch") != self.epoch:
+            # A patch for another incarnation of the game: its versions say nothing
+            # about this state
+            return False
+        if message["version"] <= self.version:
+            # Already applied (e.g. the same change arriving by HTTP and WebSocket)
+            return True
+        if message["since"] != self.version:
+            return False
+        self.state = apply_patch(self.state, message["patch"])
+        return True
@@ -0,0 +1,57 @@
+"""
+Regression tests for MonopolyBoard.play_turn, the engine behind POST /turn.
+"""
+
+import random
+
+import pytest
+
+from game_board import MonopolyBoard
+
+
+class FixedDice(random.Random):
+    """Random source whose dice always come up 'die1' and 'die2'."""
+
+    def __init__(self, die1: int, die2: int):
+        super().__init__(0)
+        self.rolls = [die1, die2]
+        self.next_roll = 0
+
+    def randint(self, a, b):
+        roll = self.rolls[self.next_roll % 2]
+        self.next_roll += 1
+        return roll
+
+
+def new_board() -> MonopolyBoard:
+    board = MonopolyBoard(players=[])
+    board.log = lambda *args, **kwargs: None
+    board.reset(["Player 1", "Player 2"])
+    return board
+
+
+@pytest.mark.parametrize("die1, die2, position", [
+    (1, 3, 4),   # Income Tax
+    (4, 6, 10),  # Just Visiting
+])
+def test_max_price_on_a_space_that_is_not_a_property(die1, die2, position):
+    # player_engine's fixed plan (AUTO_TURN_PLAN) used to fail with a KeyError here
+    board = new_board()
+    board.rng = FixedDice(die1, die2)
+
+    result = board.play_turn("Player 1", build_before=["cheapest"], max_price=200)
+
+    assert result["success"]
+    assert result["space_details"]["position"] == position
+    assert result["space_details"]["type"] not in ("regular_property", "railroad_property", "utility_property")
+
+
+def test_max_price_buys_a_cheap_property():
+    board = new_board()
+    board.rng = FixedDice(1, 2)  # Baltic Avenue, $60
+
+    result = board.play_turn("Player 1", max_price=200)
+
+    assert result["success"]
+    assert board.get_space(3).owner == "Player 1"
+    assert result["money"] == 1500 - 60
@@ -10,7 +10,7 @@ import json
 async def test_websocket():
     """Test WebSocket connection to the game server"""
     try:
-        async with websockets.connect("ws://localhost:8000/ws") as websocket:
+        async with websockets.connect("ws://localhost:8000/games/default/ws") as websocket:
             print("✓ Connected to WebSocket server")
             
             # Send a test message